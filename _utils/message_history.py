@@ -1,63 +1,354 @@
-import json
-from typing import Annotated, List, Self, get_args, get_origin
+import dataclasses
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Annotated, BinaryIO, Callable, Iterable, Iterator, List, Self, get_args, get_origin
+import pydantic_core
 from pydantic_ai.messages import (
-    ModelRequestPart, 
-    ModelResponsePart, 
-    ModelMessage, 
+    ModelRequestPart,
+    ModelResponsePart,
+    ModelMessage,
     ModelMessagesTypeAdapter,
-    ModelRequest, 
-    ModelResponse, 
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    ToolCallPart,
+    ToolReturnPart,
 )
+from _utils.message_store import MessageStore, ModelMessageTypeAdapter
+from _utils.token_estimator import TokenEstimator
 
 # A wrapper around Pydantic AI History
 
+def get_raw_types(annotated_type) -> tuple[type, ...]:
+    return get_args(get_args(annotated_type)[0]) if get_origin(annotated_type) is Annotated else get_args(annotated_type)
+
+# the part unions are introspected once, not on every append
+MODEL_REQUEST_PART_TYPES = get_raw_types(ModelRequestPart)
+MODEL_RESPONSE_PART_TYPES = get_raw_types(ModelResponsePart)
+
+@dataclass(frozen=True)
+class MessageWindow:
+    # NOTE:
+    # - Limits what get_prompt_messages sends to the model: the last `max_turns` turns and/or as many of the latest turns as fit in `max_tokens`
+    #   (estimated locally). The latest turn is always sent, even when it is over budget.
+    # - A turn starts at a user prompt and runs to the next one, so a tool call and its tool return are never split.
+    # - `keep_system_prompts`: system prompts of the dropped turns are still sent first, the agent doesn't add them again once there is a history.
+    # - `summarize(previous_summary, dropped_messages) -> summary`: optional, folds the dropped turns into a summary sent ahead of the window.
+    #   It is only called for newly dropped messages, the summary is cached between calls.
+    # - `stub_tool_returns_after`: the tool returns of the turns older than the last N are sent as a short stub instead of their content.
+    #   The stub keeps the tool name and call id, so every tool call still has its return.
+    # - `drop_superseded_tool_calls`: a tool call and its return (or retry prompt) are both left out once a later call to the same tool
+    #   with the same arguments exists, the later result replaces it. Calls without a tool call id are kept, they can't be paired safely.
+    #   Only the tools in `droppable_tools` are dropped, i.e. reads whose later result makes the earlier one stale; calls to any other tool
+    #   (writes: two identical create calls are two creates) are always sent.
+    # - Pruning only applies to what is sent, after the window is chosen (the token budget counts the unpruned turns); the history is left intact.
+    max_turns: int = None
+    max_tokens: int = None
+    keep_system_prompts: bool = True
+    summarize: Callable[[str | None, List[ModelMessage]], str] = None
+    stub_tool_returns_after: int = None
+    drop_superseded_tool_calls: bool = False
+    droppable_tools: frozenset[str] = frozenset()
+
+
+# the window used by the example apps; the apps with read tools add them, e.g. 
+# dataclasses.replace(MessageWindow.DEFAULT, drop_superseded_tool_calls=True, droppable_tools=AsanaTools.READ_TOOLS)
+MessageWindow.DEFAULT = MessageWindow(max_turns=20, max_tokens=8_000, stub_tool_returns_after=5)
+
 class MessageHistory:
-    def __init__(self):
+    # NOTE:
+    # - `__index` maps a part kind to the positions of the messages holding a part of that kind, kept up to date by every change,
+    #   so finding (or leaving out) a part kind only touches the messages that have it.
+    # - `get_messages_without` returns a filtered view: messages without the excluded kinds are shared as-is, the few that have them
+    #   are shallow copies with those parts left out. The history itself is never mutated.
+    # - Views are cached per set of excluded kinds and extended in place by `append`/`extend`, so a turn only filters its new messages.
+    #   Treat returned lists as read-only.
+    # - `__tokens` holds the running token estimate (tokens[i] = estimate of the first i messages) for the window budget.
+    # - With a store, save() persists the messages added since the last save; assign and remove_part_kind change saved messages, 
+    #   so the next save rewrites the session instead.
+    def __init__(self, window: MessageWindow = None, store: MessageStore = None, session_id: str = None):
+        self.__window = window
+        self.__store = store
+        self.__session_id = session_id
+        self.__saved = 0
+        self.__partial = False
         self.__messages: List[ModelMessage] = []
+        self.__index: dict[str, list[int]] = {}
+        self.__views: dict[frozenset[str], List[ModelMessage]] = {}
+        self.__tokens: list[int] = [0]
+        self.__summary: tuple[int, str] = (0, None)
 
     def assign(self, messages: List[ModelMessage]) -> Self:
         self.__messages = messages
+        self.__index = {}
+        self.__views = {}
+        self.__tokens = [0]
+        self.__summary = (0, None)
+        self.__saved = None
+        for position, message in enumerate(messages):
+            self.__index_message(position, message)
+
         return self
 
-    def append(self, part: ModelMessage) -> Self:
-        def get_raw_types(annotated_type):
-            return get_args(get_args(annotated_type)[0]) if get_origin(annotated_type) is Annotated else get_args(annotated_type)
+    def extend(self, messages: Iterable[ModelMessage]) -> Self:
+        # prefer extend(result.new_messages()) over assign(result.all_messages()): only the new messages are indexed
+        for message in messages:
+            self.__add(message)
 
-        model_request_parts = get_raw_types(ModelRequestPart)
-        model_response_parts = get_raw_types(ModelResponsePart)
+        return self
 
-        if isinstance(part, model_request_parts):
-            self.__messages.append(ModelRequest([part]))
+    def append(self, part: ModelMessage) -> Self:
+        if isinstance(part, MODEL_REQUEST_PART_TYPES):
+            self.__add(ModelRequest([part]))
             return self
 
-        if isinstance(part, model_response_parts):
-            self.__messages.append(ModelResponse([part]))
+        if isinstance(part, MODEL_RESPONSE_PART_TYPES):
+            self.__add(ModelResponse([part]))
             return self
 
         raise TypeError(
             f"Invalid part type: {type(part).__name__}. "
-            f"Expected one of: {', '.join([t.__name__ for t in model_request_parts + model_response_parts])}."
+            f"Expected one of: {', '.join([t.__name__ for t in MODEL_REQUEST_PART_TYPES + MODEL_RESPONSE_PART_TYPES])}."
         )
 
     def remove_part_kind(self, part_kind:str) -> Self:
-        for item in self.__messages:
-            parts = item.parts.copy()
-            for part in parts:
-                if part.part_kind == part_kind:
-                    item.parts.remove(part)
-                                    
+        # removes the parts from the history in place; use get_messages_without to leave them out of what is sent instead
+        positions = self.__index.pop(part_kind, [])
+        for position in positions:
+            item = self.__messages[position]
+            item.parts[:] = [part for part in item.parts if part.part_kind != part_kind]
+
+        if positions:
+            self.__views = {}
+            self.__saved = None
+            self.__tokens = [0]
+            for message in self.__messages:
+                self.__tokens.append(self.__tokens[-1] + TokenEstimator.estimate_message(message))
+
+        return self
+
+    @staticmethod
+    def load(store: MessageStore, session_id: str, window: MessageWindow = None, last_turns: int = None) -> "MessageHistory":
+        # loads a saved session, or only its last turns (plus the system prompts of the others); later saves append to it
+        history = MessageHistory(window, store, session_id).assign(store.load(session_id, last_turns))
+        history.__saved = len(history.__messages)
+        history.__partial = last_turns is not None
+        return history
+
+    def save(self) -> Self:
+        if self.__store is None:
+            return self
+
+        if self.__saved is None:
+            if self.__partial:
+                raise ValueError(f"Session {self.__session_id} was partially loaded, rewriting it would lose the turns that weren't loaded.")
+
+            self.__store.replace(self.__session_id, self.__messages)
+        else:
+            self.__store.append(self.__session_id, self.__messages[self.__saved:])
+
+        self.__saved = len(self.__messages)
         return self
 
     def get_all_messages(self) -> List[ModelMessage]:
         return self.__messages
 
+    def get_messages_without(self, *part_kinds: str) -> List[ModelMessage]:
+        key = frozenset(part_kinds)
+        view = self.__views.get(key)
+        if view is None:
+            view = self.__messages.copy()
+            for position in sorted({position for part_kind in key for position in self.__index.get(part_kind, ())}):
+                view[position] = MessageHistory.__without(view[position], key)
+
+            self.__views[key] = view
+
+        return view
+
+    def get_prompt_messages(self, *exclude_part_kinds: str) -> List[ModelMessage]:
+        # the messages to send with the next agent run: the history without the excluded part kinds, limited to the window if there is one.
+        # add the run's result with extend(result.new_messages()), a windowed run's all_messages() doesn't hold the whole history
+        messages = self.get_messages_without(*exclude_part_kinds) if exclude_part_kinds else self.__messages
+        start = self.__window_start()
+        messages = self.__prune(messages, start)
+        if not start:
+            return messages
+
+        prefix = []
+        if self.__window.keep_system_prompts and "system-prompt" not in exclude_part_kinds:
+            positions = self.__index.get("system-prompt", [])
+            system_prompts = {part.content: part for position in positions[:bisect_left(positions, start)] for part in self.__messages[position].parts if part.part_kind == "system-prompt"}
+            if system_prompts:
+                prefix.append(ModelRequest(list(system_prompts.values())))
+
+        if self.__window.summarize:
+            prefix.append(ModelRequest([SystemPromptPart(f"Summary of the earlier conversation:\n{self.__summarize(start)}")]))
+
+        return prefix + messages
+
+    def estimate_tokens(self) -> int:
+        return self.__tokens[-1]
+
+    def get_parts(self, part_kind: str) -> list:
+        return [part for position in self.__index.get(part_kind, ()) for part in self.__messages[position].parts if part.part_kind == part_kind]
+
+    def has_part_kind(self, part_kind: str) -> bool:
+        return bool(self.__index.get(part_kind))
+
+    #----------------------#
+    #    SERIALIZATION     #
+    #----------------------#
+
+    # NOTE:
+    # - One pydantic pass straight to bytes (indentation included), no json.loads/json.dumps round trip.
+    # - write_json streams the history `chunk_size` messages at a time, so only one chunk is ever held as bytes.
+    # - from_json parses the JSON once (pydantic_core, no model objects) and validates the messages lazily, one at a time:
+    #   with `last_turns` only the kept turns (and the system prompts of the others) are validated at all.
     def to_json(self, indent: int = None) -> str:
         return MessageHistory.messages_to_json(self.__messages, indent=indent)
 
+    def to_json_bytes(self, indent: int = None) -> bytes:
+        return ModelMessagesTypeAdapter.dump_json(self.__messages, indent=indent)
+
+    def write_json(self, stream: BinaryIO, chunk_size: int = 256) -> int:
+        # writes a compact JSON array to a binary file or socket file (socket.makefile("wb")), returns the bytes written
+        written = stream.write(b"[")
+        for start in range(0, len(self.__messages), chunk_size):
+            chunk = ModelMessagesTypeAdapter.dump_json(self.__messages[start:start + chunk_size])
+            written += stream.write(chunk[1:-1] if not start else b"," + chunk[1:-1])
+
+        return written + stream.write(b"]")
+
+    @staticmethod
+    def from_json(data: str | bytes, window: MessageWindow = None, last_turns: int = None) -> "MessageHistory":
+        items = pydantic_core.from_json(data)
+        start = 0
+        if last_turns is not None:
+            turns = [position for position, item in enumerate(items) if any(part.get("part_kind") == "user-prompt" for part in item["parts"])]
+            count = max(last_turns, 1)
+            start = turns[-count] if len(turns) >= count else 0
+
+        messages = list(MessageHistory.iter_json_items(items[start:]))
+        system_prompts = [part for item in items[:start] for part in item["parts"] if part.get("part_kind") == "system-prompt"]
+        if system_prompts:
+            messages.insert(0, ModelMessageTypeAdapter.validate_python({**items[0], "parts": system_prompts}))
+
+        return MessageHistory(window).assign(messages)
+
+    @staticmethod
+    def iter_json(data: str | bytes) -> Iterator[ModelMessage]:
+        return MessageHistory.iter_json_items(pydantic_core.from_json(data))
+
+    @staticmethod
+    def iter_json_items(items: list[dict]) -> Iterator[ModelMessage]:
+        for item in items:
+            yield ModelMessageTypeAdapter.validate_python(item)
+
     @staticmethod
     def messages_to_json(messages: List[ModelMessage], indent: int = None) -> str:
-        json_str = ModelMessagesTypeAdapter.dump_json(messages)
-        parsed_json = json.loads(json_str)
-        pretty_json = json.dumps(parsed_json, indent=indent)
-        
-        return pretty_json
+        return ModelMessagesTypeAdapter.dump_json(messages, indent=indent).decode()
+
+    def __add(self, message: ModelMessage):
+        self.__messages.append(message)
+        self.__index_message(len(self.__messages) - 1, message)
+        for key, view in self.__views.items():
+            view.append(MessageHistory.__without(message, key))
+
+    def __index_message(self, position: int, message: ModelMessage):
+        for part_kind in {part.part_kind for part in message.parts}:
+            self.__index.setdefault(part_kind, []).append(position)
+
+        self.__tokens.append(self.__tokens[-1] + TokenEstimator.estimate_message(message))
+
+    def __window_start(self) -> int:
+        # the position of the oldest message in the window: always a turn start (a user prompt), 0 if everything fits
+        window = self.__window
+        turns = self.__index.get("user-prompt")
+        if window is None or not turns:
+            return 0
+
+        start = 0
+        if window.max_turns is not None and len(turns) > window.max_turns:
+            start = turns[-window.max_turns] if window.max_turns > 0 else turns[-1]
+
+        if window.max_tokens is not None:
+            # the oldest turn from which the rest of the history fits in the budget; tokens[] only grows, so it can be bisected
+            tokens = self.__tokens
+            turn = bisect_left(turns, tokens[-1] - window.max_tokens, key=lambda position: tokens[position])
+            start = max(start, turns[min(turn, len(turns) - 1)])
+
+        return start
+
+    def __prune(self, messages: List[ModelMessage], start: int) -> List[ModelMessage]:
+        # messages[start:] with the stale tool returns stubbed and the superseded tool calls left out, as copies of the messages they touch
+        window = self.__window
+        if window is None or (window.stub_tool_returns_after is None and not (window.drop_superseded_tool_calls and window.droppable_tools)):
+            return messages[start:] if start else messages
+
+        # the tool returns before position `stale` are stubbed
+        stale, keep = 0, window.stub_tool_returns_after
+        if keep is not None:
+            turns = self.__index.get("user-prompt", [])
+            stale = len(self.__messages) if keep <= 0 else turns[-keep] if len(turns) >= keep else 0
+
+        returns = self.__index.get("tool-return", [])
+        positions = set(returns[bisect_left(returns, start):bisect_left(returns, stale)])
+        superseded = set()
+        if window.drop_superseded_tool_calls and window.droppable_tools:
+            calls = self.__index.get("tool-call", [])
+            latest = set()
+            for position in reversed(calls[bisect_left(calls, start):]):
+                for part in reversed(messages[position].parts):
+                    if part.part_kind != "tool-call" or part.tool_call_id is None or part.tool_name not in window.droppable_tools:
+                        continue
+
+                    key = (part.tool_name, MessageHistory.__arguments(part))
+                    if key in latest:
+                        superseded.add(part.tool_call_id)
+                    else:
+                        latest.add(key)
+
+            if superseded:
+                for part_kind in ("tool-call", "tool-return", "retry-prompt"):
+                    paired = self.__index.get(part_kind, [])
+                    positions.update(position for position in paired[bisect_left(paired, start):]
+                                     if any(getattr(part, "tool_call_id", None) in superseded for part in messages[position].parts))
+
+        if not positions:
+            return messages[start:] if start else messages
+
+        pruned = messages[start:]
+        for position in positions:
+            message = messages[position]
+            parts = [MessageHistory.__stub(part) if part.part_kind == "tool-return" and position < stale else part
+                     for part in message.parts if getattr(part, "tool_call_id", None) not in superseded]
+            pruned[position - start] = dataclasses.replace(message, parts=parts) if parts else None
+
+        return [message for message in pruned if message is not None]
+
+    def __summarize(self, start: int) -> str:
+        summarized, summary = self.__summary
+        if start < summarized:
+            summarized, summary = 0, None
+
+        if start > summarized:
+            summary = self.__window.summarize(summary, self.__messages[summarized:start])
+            self.__summary = (start, summary)
+
+        return summary
+
+    @staticmethod
+    def __stub(part: ToolReturnPart) -> ToolReturnPart:
+        return dataclasses.replace(part, content=f"Result omitted from an earlier turn, call {part.tool_name} again if it is needed.")
+
+    @staticmethod
+    def __arguments(part: ToolCallPart) -> str:
+        # normalized, so the same arguments match whether the model sent them as JSON or as a dict
+        return pydantic_core.to_json(part.args_as_dict()).decode()
+
+    @staticmethod
+    def __without(message: ModelMessage, part_kinds: frozenset[str]) -> ModelMessage:
+        if not any(part.part_kind in part_kinds for part in message.parts):
+            return message
+
+        return dataclasses.replace(message, parts=[part for part in message.parts if part.part_kind not in part_kinds])
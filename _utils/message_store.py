@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+from typing import List, Self
+from pydantic import TypeAdapter
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter
+from pydantic_ai.usage import Usage
+
+# A durable, append-only store of Pydantic AI messages, one row per message and per session
+
+# the element type of ModelMessagesTypeAdapter, to serialize one message per row
+ModelMessageTypeAdapter = TypeAdapter(ModelMessage)
+UsageTypeAdapter = TypeAdapter(Usage)
+
+class MessageStore:
+    # NOTE:
+    # - Saving a turn only inserts its new messages (one transaction), so it costs O(new messages) however long the session is.
+    # - Each row is flagged when it starts a turn (holds a user prompt) or holds a system prompt, so a session can be loaded
+    #   partially: its last N turns plus the system prompts of the turns left out.
+    # - Loading validates all the rows in one ModelMessagesTypeAdapter call over the joined JSON.
+    # - One connection shared by the threads of the process (e.g. the Streamlit sessions), serialized by a lock; WAL keeps the file readable meanwhile.
+    MIGRATION = (
+        """
+        CREATE TABLE IF NOT EXISTS Message (
+            SessionId TEXT NOT NULL,
+            Seq INTEGER NOT NULL,
+            TurnStart INTEGER NOT NULL,
+            SystemPrompt INTEGER NOT NULL,
+            Data BLOB NOT NULL,
+            PRIMARY KEY (SessionId, Seq)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS IX_Message_SessionId_TurnStart ON Message (SessionId, TurnStart, Seq)",
+        """
+        CREATE TABLE IF NOT EXISTS SessionUsage (
+            SessionId TEXT NOT NULL PRIMARY KEY,
+            Data BLOB NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    def __init__(self, database: str = "messages.db"):
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode = WAL")
+        self.__connection.execute("PRAGMA synchronous = NORMAL")
+        with self.__connection:
+            for sql in MessageStore.MIGRATION:
+                self.__connection.execute(sql)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def append(self, session_id: str, messages: List[ModelMessage]) -> int:
+        return self.__write(session_id, messages, replace=False)
+
+    def replace(self, session_id: str, messages: List[ModelMessage]) -> int:
+        return self.__write(session_id, messages, replace=True)
+
+    def delete(self, session_id: str):
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM Message WHERE SessionId = ?", (session_id,))
+            self.__connection.execute("DELETE FROM SessionUsage WHERE SessionId = ?", (session_id,))
+
+    def save_usage(self, session_id: str, usage: Usage):
+        with self.__lock, self.__connection:
+            self.__connection.execute("INSERT OR REPLACE INTO SessionUsage (SessionId, Data) VALUES (?, ?)", (session_id, UsageTypeAdapter.dump_json(usage)))
+
+    def load_usage(self, session_id: str) -> Usage:
+        with self.__lock:
+            row = self.__connection.execute("SELECT Data FROM SessionUsage WHERE SessionId = ?", (session_id,)).fetchone()
+
+        return UsageTypeAdapter.validate_json(row[0]) if row else Usage()
+
+    def count(self, session_id: str) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM Message WHERE SessionId = ?", (session_id,)).fetchone()[0]
+
+    def load(self, session_id: str, last_turns: int = None) -> List[ModelMessage]:
+        with self.__lock:
+            start = 0
+            if last_turns is not None:
+                row = self.__connection.execute(
+                    "SELECT Seq FROM Message WHERE SessionId = ? AND TurnStart = 1 ORDER BY Seq DESC LIMIT 1 OFFSET ?", (session_id, max(last_turns - 1, 0))
+                ).fetchone()
+                start = row[0] if row else 0
+
+            system_rows = self.__connection.execute(
+                "SELECT Data FROM Message WHERE SessionId = ? AND Seq < ? AND SystemPrompt = 1 ORDER BY Seq", (session_id, start)
+            ).fetchall()
+            rows = self.__connection.execute("SELECT Data FROM Message WHERE SessionId = ? AND Seq >= ? ORDER BY Seq", (session_id, start)).fetchall()
+
+        messages = MessageStore.__validate(rows)
+        if system_rows:
+            # only the system prompts of the turns left out are kept, in a request of their own ahead of the loaded turns
+            system_messages = MessageStore.__validate(system_rows)
+            system_message = system_messages[0]
+            system_message.parts = [part for message in system_messages for part in message.parts if part.part_kind == "system-prompt"]
+            messages.insert(0, system_message)
+
+        return messages
+
+    def __write(self, session_id: str, messages: List[ModelMessage], replace: bool) -> int:
+        rows = [MessageStore.__row(message) for message in messages]
+        with self.__lock, self.__connection:
+            if replace:
+                self.__connection.execute("DELETE FROM Message WHERE SessionId = ?", (session_id,))
+
+            # the (SessionId, Seq) primary key makes MAX(Seq) a single index lookup
+            seq = self.__connection.execute("SELECT COALESCE(MAX(Seq) + 1, 0) FROM Message WHERE SessionId = ?", (session_id,)).fetchone()[0]
+            self.__connection.executemany(
+                "INSERT INTO Message (SessionId, Seq, TurnStart, SystemPrompt, Data) VALUES (?, ?, ?, ?, ?)",
+                [(session_id, seq + offset, *row) for offset, row in enumerate(rows)]
+            )
+
+        return len(rows)
+
+    @staticmethod
+    def __row(message: ModelMessage) -> tuple[int, int, bytes]:
+        part_kinds = {part.part_kind for part in message.parts}
+        return int("user-prompt" in part_kinds), int("system-prompt" in part_kinds), ModelMessageTypeAdapter.dump_json(message)
+
+    @staticmethod
+    def __validate(rows: list[tuple[bytes]]) -> List[ModelMessage]:
+        return ModelMessagesTypeAdapter.validate_json(b"[" + b",".join(data for data, in rows) + b"]")
@@ -0,0 +1,198 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterator
+from pydantic_ai.usage import Usage
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.message_store import MessageStore
+
+# Isolated conversation state (history and usage) per session id, with a bound on the messages kept in memory
+
+@dataclass
+class Session:
+    session_id: str
+    history: MessageHistory = None
+    usage: Usage = field(default_factory=Usage)
+    last_used: float = field(default_factory=time.monotonic)
+    pins: int = 0
+    # held for a whole turn, so two turns of the same session don't interleave their messages
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+class SessionManager:
+    # NOTE:
+    # - Every session gets its own MessageHistory and Usage; nothing is shared between sessions.
+    # - Sessions are used through `with manager.session(session_id) as session:`. On exit the turn is saved to the store
+    #   (history.save() only appends the new messages) along with the usage, so evicting a session never has to write anything.
+    # - When the sessions in memory hold more than `max_messages` messages, the least recently used ones are dropped from memory.
+    #   Sessions in use (pinned) are never evicted.
+    # - A session that isn't in memory is rehydrated from the store on demand, all of it or only its `last_turns` turns.
+    # - One turn per session at a time: a turn holds the session's lock from enter to exit, a second turn of the same session waits for it.
+    # - The store is read and written under the session's lock only, the manager-wide lock guards the in-memory bookkeeping,
+    #   so a slow load or save never holds up the other sessions.
+    # - From async code use `async with manager.session_async(session_id) as session:`, the store I/O runs on a worker thread and
+    #   the wait for the session is polled on the event loop, so turns queued on a busy session don't tie up the executor threads.
+    def __init__(self, store: MessageStore, window: MessageWindow = None, max_messages: int = 50_000, last_turns: int = None):
+        self.__store = store
+        self.__window = window
+        self.__max_messages = max_messages
+        self.__last_turns = last_turns
+        self.__lock = threading.Lock()
+        self.__sessions: OrderedDict[str, Session] = OrderedDict()
+        self.__messages: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rehydrations = 0
+        self.evictions = 0
+
+    @contextlib.contextmanager
+    def session(self, session_id: str) -> Iterator[Session]:
+        session = self.__acquire(session_id)
+        try:
+            yield session
+        finally:
+            self.__release(session)
+
+    @contextlib.asynccontextmanager
+    async def session_async(self, session_id: str) -> AsyncIterator[Session]:
+        session = self.__pin(session_id)
+        try:
+            while not session.lock.acquire(blocking=False):
+                await asyncio.sleep(0.01)
+        except BaseException:
+            self.__unpin(session)
+            raise
+
+        loading = asyncio.ensure_future(asyncio.to_thread(self.__load, session)) if session.history is None else None
+        try:
+            if loading is not None:
+                await asyncio.shield(loading)
+
+            yield session
+        finally:
+            # a cancelled turn still lets the load finish before the next turn can start another one
+            if loading is not None:
+                await asyncio.wait([loading])
+
+            await asyncio.to_thread(self.__release, session)
+
+    def evict(self, session_id: str) -> bool:
+        with self.__lock:
+            session = self.__sessions.get(session_id)
+            if session is None or session.pins:
+                return False
+
+            self.__evict(session)
+            return True
+
+    def close(self):
+        with self.__lock:
+            sessions = list(self.__sessions.values())
+            self.__sessions.clear()
+            self.__messages.clear()
+
+        # a session in use is saved once its turn is over
+        for session in sessions:
+            with session.lock:
+                self.__save(session)
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return {
+                "sessions": len(self.__sessions),
+                "messages": sum(self.__messages.values()),
+                "max_messages": self.__max_messages,
+                "hits": self.hits,
+                "misses": self.misses,
+                "rehydrations": self.rehydrations,
+                "evictions": self.evictions,
+            }
+
+    def session_stats(self) -> dict[str, dict[str, int | float]]:
+        # the sessions in memory, least recently used first
+        with self.__lock:
+            now = time.monotonic()
+            return {
+                session_id: {
+                    "messages": self.__messages.get(session_id, 0),
+                    "estimated_tokens": session.history.estimate_tokens() if session.history is not None else 0,
+                    "idle_seconds": round(now - session.last_used, 3),
+                    "pinned": session.pins > 0,
+                }
+                for session_id, session in self.__sessions.items()
+            }
+
+    def __acquire(self, session_id: str) -> Session:
+        session = self.__pin(session_id)
+        session.lock.acquire()
+        try:
+            if session.history is None:
+                self.__load(session)
+        except BaseException:
+            self.__release(session)
+            raise
+
+        return session
+
+    def __release(self, session: Session):
+        try:
+            self.__save(session)
+        finally:
+            self.__unpin(session)
+            session.lock.release()
+
+    def __pin(self, session_id: str) -> Session:
+        # pinned before waiting for the turn, so the session can't be evicted meanwhile
+        with self.__lock:
+            session = self.__sessions.get(session_id)
+            if session is not None:
+                self.hits += 1
+                self.__sessions.move_to_end(session_id)
+            else:
+                self.misses += 1
+                session = Session(session_id)
+                self.__sessions[session_id] = session
+
+            session.pins += 1
+            session.last_used = time.monotonic()
+            return session
+
+    def __load(self, session: Session):
+        # both are set once loaded, a failed load leaves the session unloaded (and nothing to save)
+        history = MessageHistory.load(self.__store, session.session_id, self.__window, self.__last_turns)
+        usage = self.__store.load_usage(session.session_id)
+        session.history, session.usage = history, usage
+        if history.get_all_messages():
+            with self.__lock:
+                self.rehydrations += 1
+
+    def __unpin(self, session: Session):
+        with self.__lock:
+            session.pins -= 1
+            session.last_used = time.monotonic()
+            if self.__sessions.get(session.session_id) is session and session.history is not None:
+                self.__messages[session.session_id] = len(session.history.get_all_messages())
+
+            # least recently used first; the sessions in use are skipped
+            total = sum(self.__messages.values())
+            for candidate in list(self.__sessions.values()):
+                if total <= self.__max_messages:
+                    break
+
+                if not candidate.pins:
+                    total -= self.__messages.get(candidate.session_id, 0)
+                    self.__evict(candidate)
+
+    def __save(self, session: Session):
+        if session.history is None:
+            return
+
+        session.history.save()
+        self.__store.save_usage(session.session_id, session.usage)
+
+    def __evict(self, session: Session):
+        self.__sessions.pop(session.session_id, None)
+        self.__messages.pop(session.session_id, None)
+        self.evictions += 1
@@ -0,0 +1,35 @@
+from pydantic_ai.messages import ModelMessage, ModelRequestPart, ModelResponsePart, RetryPromptPart, ToolCallPart, ToolReturnPart
+
+# A local token estimate for Pydantic AI messages, good enough to budget a prompt without calling a tokenizer
+
+class TokenEstimator:
+    # NOTE:
+    # - ~4 characters per token is the usual rule of thumb for English text with the GPT tokenizers.
+    # - Every part also pays a few tokens of framing (role, separators, tool call ids).
+    CHARS_PER_TOKEN = 4
+    PART_OVERHEAD = 4
+
+    @staticmethod
+    def estimate_text(text: str) -> int:
+        return -(-len(text) // TokenEstimator.CHARS_PER_TOKEN)
+
+    @staticmethod
+    def estimate_part(part: ModelRequestPart | ModelResponsePart) -> int:
+        if isinstance(part, ToolCallPart):
+            text = part.tool_name + part.args_as_json_str()
+        elif isinstance(part, ToolReturnPart):
+            text = part.model_response_str()
+        elif isinstance(part, RetryPromptPart):
+            text = part.model_response()
+        else:
+            text = part.content
+
+        return TokenEstimator.estimate_text(text) + TokenEstimator.PART_OVERHEAD
+
+    @staticmethod
+    def estimate_message(message: ModelMessage) -> int:
+        return sum(TokenEstimator.estimate_part(part) for part in message.parts)
+
+    @staticmethod
+    def estimate_messages(messages: list[ModelMessage]) -> int:
+        return sum(TokenEstimator.estimate_message(message) for message in messages)
@@ -0,0 +1,218 @@
+# NOTES:
+# Benchmark suite for the mock Asana backend.
+# - Seeds a dataset per size through the public API (see asana_data_generator.py) and times every Asana_Api method.
+# - Reports p50/p95/p99 latencies, calls/sec and rows/sec per method as JSON, tagged with the git commit,
+#   so runs from different commits can be compared with --compare.
+#
+# To run:
+#   python benchmarks/asana_api_bench.py --sizes 10x100 100x1000 --output results.json
+#   python benchmarks/asana_api_bench.py --sizes 1000x1000 --storage file --iterations 500
+#   python benchmarks/asana_api_bench.py --sizes 10x100 --compare baseline.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import Asana_Api, AsanaPage, AsanaProjectUpdate, AsanaStorage, AsanaTaskCreate, AsanaTaskStatusUpdate, AsanaTaskUpdate
+from asana_data_generator import STATUSES, AsanaDataGenerator, AsanaDataset
+
+@dataclass
+class BenchContext:
+    api: Asana_Api
+    dataset: AsanaDataset
+    generator: AsanaDataGenerator
+    random: random.Random
+
+    def project(self):
+        return self.random.choice(self.dataset.projects)
+
+    def task(self):
+        return self.random.choice(self.dataset.task_sample)
+
+    def project_name(self, project_id: str) -> str:
+        return next(project.name for project in self.dataset.projects if project.id == project_id)
+
+    def new_task(self):
+        # a throwaway task for the destructive cases, created outside of the timed call
+        return self.api.create_task(self.project().id, self.generator.task_name(), self.generator.due_date())
+
+# each case prepares its arguments (untimed) and returns the call to time
+CASES: dict[str, Callable[[BenchContext], Callable[[], Any]]] = {
+    # projects
+    "create_project": lambda ctx: lambda: ctx.api.create_project(f"Bench {ctx.random.random()}"),
+    "get_project_id": lambda ctx: (lambda name: lambda: ctx.api.get_project_id(name))(ctx.project().name),
+    "get_project_by_id": lambda ctx: (lambda id: lambda: ctx.api.get_project_by_id(id))(ctx.project().id),
+    "get_project_by_name": lambda ctx: (lambda name: lambda: ctx.api.get_project_by_name(name))(ctx.project().name),
+    "get_projects": lambda ctx: ctx.api.get_projects,
+    "get_projects_page": lambda ctx: lambda: ctx.api.get_projects_page(limit=50),
+    "update_project": lambda ctx: (lambda project: lambda: ctx.api.update_project(project.id, AsanaProjectUpdate(project.name)))(ctx.project()),
+    "iter_projects": lambda ctx: lambda: list(ctx.api.iter_projects()),
+    "delete_project_by_id": lambda ctx: (lambda id: lambda: ctx.api.delete_project_by_id(id))(ctx.api.create_project(f"Bench {ctx.random.random()}").id),
+    "delete_project": lambda ctx: (lambda name: lambda: ctx.api.delete_project(name))(ctx.api.create_project(f"Bench {ctx.random.random()}").name),
+
+    # tasks
+    "create_task": lambda ctx: (lambda id: lambda: ctx.api.create_task(id, ctx.generator.task_name(), ctx.generator.due_date()))(ctx.project().id),
+    "create_tasks": lambda ctx: (lambda id, tasks: lambda: ctx.api.create_tasks(id, tasks))(
+        ctx.project().id, [AsanaTaskCreate(ctx.generator.task_name(), ctx.generator.due_date()) for _ in range(100)]),
+    "get_task_by_id": lambda ctx: (lambda id: lambda: ctx.api.get_task_by_id(id))(ctx.task().id),
+    "get_task_by_name": lambda ctx: (lambda task: lambda: ctx.api.get_task_by_name(ctx.project_name(task.project_id), task.name))(ctx.task()),
+    "get_tasks_by_project_id": lambda ctx: (lambda id: lambda: ctx.api.get_tasks_by_project_id(id))(ctx.project().id),
+    "get_tasks_by_project_name": lambda ctx: (lambda name: lambda: ctx.api.get_tasks_by_project_name(name))(ctx.project().name),
+    "get_tasks_page_by_project_id": lambda ctx: (lambda id: lambda: ctx.api.get_tasks_page_by_project_id(id, limit=50))(ctx.project().id),
+    "get_tasks_page_by_project_name": lambda ctx: (lambda name: lambda: ctx.api.get_tasks_page_by_project_name(name, limit=50))(ctx.project().name),
+    "iter_tasks_by_project_id": lambda ctx: (lambda id: lambda: list(ctx.api.iter_tasks_by_project_id(id)))(ctx.project().id),
+    "get_tasks_page_by_status": lambda ctx: (lambda id, status: lambda: ctx.api.get_tasks_page_by_project_id(id, limit=50, status=status))(ctx.project().id, ctx.random.choice(STATUSES)),
+    "get_tasks_by_ids": lambda ctx: (lambda ids: lambda: ctx.api.get_tasks_by_ids(ids))([ctx.task().id for _ in range(50)]),
+    "get_tasks_page_by_project_names": lambda ctx: (lambda names: lambda: ctx.api.get_tasks_page_by_project_names(names, limit=50))(
+        [ctx.project().name for _ in range(5)]),
+    "search_tasks": lambda ctx: (lambda query: lambda: ctx.api.search_tasks(query))(ctx.generator.task_name()),
+    "get_task_status_counts": lambda ctx: ctx.api.get_task_status_counts,
+    "get_project_summaries": lambda ctx: ctx.api.get_project_summaries,
+    "changes_since": lambda ctx: (lambda seq: lambda: ctx.api.changes_since(seq, limit=1000))(ctx.random.randrange(ctx.dataset.total_tasks)),
+    "update_task_status": lambda ctx: (lambda id: lambda: ctx.api.update_task_status(id, ctx.random.choice(STATUSES)))(ctx.task().id),
+    "update_task_statuses": lambda ctx: (lambda updates: lambda: ctx.api.update_task_statuses(updates))(
+        [AsanaTaskStatusUpdate(ctx.task().id, ctx.random.choice(STATUSES)) for _ in range(100)]),
+    "update_task": lambda ctx: (lambda id: lambda: ctx.api.update_task(id, AsanaTaskUpdate(due_date=ctx.generator.due_date())))(ctx.task().id),
+    "delete_task_by_id": lambda ctx: (lambda id: lambda: ctx.api.delete_task_by_id(id))(ctx.new_task().id),
+    "delete_tasks": lambda ctx: (lambda ids: lambda: ctx.api.delete_tasks(ids))([ctx.new_task().id for _ in range(10)]),
+    "delete_task_by_name": lambda ctx: (lambda task: lambda: ctx.api.delete_task_by_name(ctx.project_name(task.project_id), task.name))(ctx.new_task()),
+}
+
+# cases that read every project or every task, they get a tenth of the iterations to keep large sizes practical
+FULL_SCAN_CASES = {"get_projects", "iter_projects", "get_task_status_counts", "get_project_summaries"}
+
+def rows_of(result: Any) -> int:
+    if isinstance(result, AsanaPage):
+        return len(result.items)
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+
+    return 1 if result else 0
+
+def percentile(samples: list[float], percent: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+def run_case(ctx: BenchContext, prepare: Callable[[BenchContext], Callable[[], Any]], iterations: int) -> dict:
+    latencies = []
+    rows = 0
+    for _ in range(iterations):
+        call = prepare(ctx)
+        start = time.perf_counter()
+        result = call()
+        latencies.append(time.perf_counter() - start)
+        rows += rows_of(result)
+
+    total = sum(latencies)
+    return {
+        "iterations": iterations,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "calls_per_sec": iterations / total if total else None,
+        "rows_per_sec": rows / total if total else None,
+    }
+
+def run_size(projects: int, tasks_per_project: int, storage: str, iterations: int, seed: int, cases: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        if storage == "file":
+            asana_storage = AsanaStorage.file(os.path.join(directory, "asana.db"))
+        else:
+            asana_storage = AsanaStorage.memory(f"asana_bench_{projects}x{tasks_per_project}")
+
+        with Asana_Api(asana_storage) as api:
+            generator = AsanaDataGenerator(api, seed)
+            start = time.perf_counter()
+            dataset = generator.generate(projects, tasks_per_project)
+            seed_seconds = time.perf_counter() - start
+
+            ctx = BenchContext(api, dataset, generator, random.Random(seed))
+            results = {}
+            for name in cases:
+                case_iterations = max(1, iterations // 10) if name in FULL_SCAN_CASES else iterations
+                results[name] = run_case(ctx, CASES[name], case_iterations)
+                print(f"  {name:<30} p50 {results[name]['p50_ms']:>9.3f} ms  p99 {results[name]['p99_ms']:>9.3f} ms", file=sys.stderr)
+
+        return {
+            "projects": projects,
+            "tasks_per_project": tasks_per_project,
+            "total_tasks": dataset.total_tasks,
+            "seed_seconds": seed_seconds,
+            "seed_rows_per_sec": dataset.total_tasks / seed_seconds if seed_seconds else None,
+            "methods": results,
+        }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report: dict, baseline: dict):
+    # p50 ratio per method and size, > 1.0 means slower than the baseline
+    print(f"comparing {report['commit']} against {baseline['commit']} (p50 ratio, >1.0 is slower)")
+    baseline_sizes = {(size["projects"], size["tasks_per_project"]): size for size in baseline["sizes"]}
+    for size in report["sizes"]:
+        previous = baseline_sizes.get((size["projects"], size["tasks_per_project"]))
+        if not previous:
+            continue
+
+        print(f"{size['projects']}x{size['tasks_per_project']}")
+        for name, result in size["methods"].items():
+            if before := previous["methods"].get(name):
+                ratio = result["p50_ms"] / before["p50_ms"] if before["p50_ms"] else float("nan")
+                flag = "  <-- regression" if ratio > 1.2 else ""
+                print(f"  {name:<30}{before['p50_ms']:>10.3f} -> {result['p50_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks every Asana_Api method at several dataset sizes.")
+    parser.add_argument("--sizes", nargs="+", default=["10x100", "100x1000"], help="dataset sizes as <projects>x<tasks per project>, e.g. 1000x1000 for 1M tasks")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per method and size")
+    parser.add_argument("--storage", choices=["memory", "file"], default="file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES), metavar="CASE")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "storage": args.storage,
+        "iterations": args.iterations,
+        "seed": args.seed,
+        "sizes": [],
+    }
+
+    for size in args.sizes:
+        projects, tasks_per_project = (int(value) for value in size.lower().split("x"))
+        print(f"{projects} projects x {tasks_per_project} tasks", file=sys.stderr)
+        report["sizes"].append(run_size(projects, tasks_per_project, args.storage, args.iterations, args.seed, args.cases))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(report, json.load(file))
+
+if __name__ == "__main__":
+    main()
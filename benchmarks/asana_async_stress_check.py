@@ -0,0 +1,127 @@
+# NOTES:
+# Stress check of AsyncAsana_Api under concurrent read/write load, run on one event loop.
+# - `--clients` coroutines each issue a mix of reads (listings, lookups, searches) and writes (create, status updates, deletes),
+#   all through the awaitable facade: the reads run on the bounded pool, the writes on the single writer thread.
+# - A heartbeat coroutine ticks every 10ms meanwhile, its worst delay is how long the event loop was blocked.
+# - Checks: no call fails (e.g. "database is locked"), every created task is there and the deleted ones are gone,
+#   the last status written by each client is the one stored, every write ran on the writer thread and every read on the pool,
+#   and the worst loop stall stays under `--max-stall`.
+# - Exits with status 1 when a check fails.
+# To run: python benchmarks/asana_async_stress_check.py --clients 200 --rounds 10 [--storage memory]
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from asana_data_generator import STATUSES, AsanaDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import Asana_Api, AsanaStorage, AsyncAsana_Api
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+
+    return worst
+
+def record_threads(api: Asana_Api, names: list[str]) -> dict[str, set[str]]:
+    # the facade looks the methods up on the Asana_Api instance, so wrapping them there records the thread each call ran on
+    threads = defaultdict(set)
+    for name in names:
+        def recorded(*args, __name=name, __method=getattr(api, name), **kwargs):
+            threads[__name].add(threading.current_thread().name)
+            return __method(*args, **kwargs)
+
+        setattr(api, name, recorded)
+
+    return threads
+
+READS = ["get_tasks_by_project_name", "get_tasks_page_by_project_id", "get_task_by_id", "search_tasks"]
+WRITES = ["create_task", "update_task_status", "delete_task_by_id"]
+
+async def client(api: AsyncAsana_Api, dataset, number: int, rounds: int) -> dict:
+    rng = random.Random(number)
+    project = dataset.projects[number % len(dataset.projects)]
+    created, deleted, last_status = [], [], {}
+    for round in range(rounds):
+        await api.get_tasks_by_project_name(project.name)
+        await api.get_tasks_page_by_project_id(project.id, limit=50, status=rng.choice(STATUSES))
+        await api.get_task_by_id(rng.choice(dataset.task_sample).id)
+        await api.search_tasks(rng.choice(["budget", "review", "release"]))
+
+        task = await api.create_task(project.id, f"Stress {number}-{round}", "2025-01-01")
+        created.append(task.id)
+        status = rng.choice(STATUSES)
+        await api.update_task_status(task.id, status)
+        last_status[task.id] = status
+
+        if round % 3 == 2:
+            victim = created.pop(0)
+            await api.delete_task_by_id(victim)
+            deleted.append(victim)
+            last_status.pop(victim)
+
+    return {"created": created, "deleted": deleted, "last_status": last_status}
+
+async def main_async(arguments: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        storage = AsanaStorage.memory("asana_async_stress_check") if arguments.storage == "memory" else AsanaStorage.file(os.path.join(directory, "asana.db"))
+        sync_api = Asana_Api(storage)
+        api = AsyncAsana_Api(sync_api, arguments.workers)
+        try:
+            projects, tasks_per_project = (int(value) for value in arguments.size.lower().split("x"))
+            dataset = await api.run_write(AsanaDataGenerator(sync_api).generate, projects, tasks_per_project)
+
+            threads = record_threads(sync_api, [*READS, *WRITES])
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(heartbeat(stop))
+            start = time.perf_counter()
+            results = await asyncio.gather(*(client(api, dataset, number, arguments.rounds) for number in range(arguments.clients)), return_exceptions=True)
+            elapsed = time.perf_counter() - start
+            stop.set()
+            worst_stall = await monitor
+
+            failures = [result for result in results if isinstance(result, BaseException)]
+            outcomes = [result for result in results if not isinstance(result, BaseException)]
+            created = {task_id: status for outcome in outcomes for task_id, status in outcome["last_status"].items()}
+            deleted = [task_id for outcome in outcomes for task_id in outcome["deleted"]]
+            stored = {task.id: task.status for task in await api.get_tasks_by_ids([*created, *deleted])}
+
+            checks = {
+                f"no failed calls ({len(failures)} failed)": not failures,
+                f"created tasks stored ({len(stored.keys() & created.keys())}/{len(created)})": stored.keys() >= created.keys(),
+                f"deleted tasks gone ({len(stored.keys() & set(deleted))} left)": not stored.keys() & set(deleted),
+                "last written status stored": all(stored.get(task_id) == status for task_id, status in created.items()),
+                "writes ran on the writer thread": all(threads[name] == {"asana-write_0"} for name in WRITES),
+                "reads ran on the pool": all(threads[name] and "asana-write_0" not in threads[name] for name in READS),
+                f"worst loop stall {worst_stall * 1000:.0f}ms < {arguments.max_stall * 1000:.0f}ms": worst_stall < arguments.max_stall,
+            }
+
+            calls = arguments.clients * arguments.rounds * 7
+            print(f"{arguments.clients} clients x {arguments.rounds} rounds, ~{calls:,} calls in {elapsed:.2f}s ({calls / elapsed:,.0f} calls/s)")
+            for name, passed in checks.items():
+                print(f"{'ok' if passed else 'FAIL':<6}{name}")
+            for failure in failures[:5]:
+                print(f"      {type(failure).__name__}: {failure}")
+
+            return 0 if all(checks.values()) else 1
+        finally:
+            api.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress checks AsyncAsana_Api under concurrent reads and writes on one event loop.")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent client coroutines")
+    parser.add_argument("--rounds", type=int, default=10, help="read/write rounds per client")
+    parser.add_argument("--size", default="20x500", help="seeded dataset as <projects>x<tasks per project>")
+    parser.add_argument("--storage", choices=["file", "memory"], default="file", help="a database file (WAL) or an in-memory database")
+    parser.add_argument("--workers", type=int, default=4, help="AsyncAsana_Api read pool size")
+    parser.add_argument("--max-stall", type=float, default=0.5, help="worst acceptable event loop stall in seconds")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
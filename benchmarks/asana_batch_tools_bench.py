@@ -0,0 +1,73 @@
+# NOTES:
+# Counts the model round trips an agent needs to answer a multi-project question ("how are projects A, B, C... doing?").
+# The model is scripted with pydantic_ai's FunctionModel, so no API key is needed; each model request sleeps --latency seconds
+# to stand in for a real LLM call.
+# - "sequential": one get_tasks_by_project_name call per model response, what a model does without a batch tool.
+# - "parallel": every get_tasks_by_project_name call in a single model response (models with parallel tool calls).
+# - "batch": a single get_tasks_for_projects call.
+# To run: python benchmarks/asana_batch_tools_bench.py --projects 2 5 10 --latency 0.5
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_core import to_json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaStorage, AsanaTaskCreate
+from asana_tools import AsyncAsanaTools
+
+def returned_tools(messages: list[ModelMessage]) -> int:
+    return sum(isinstance(part, ToolReturnPart) for message in messages if isinstance(message, ModelRequest) for part in message.parts)
+
+def scripted_model(strategy: str, project_names: list[str], latency: float) -> FunctionModel:
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(latency)
+        returned = returned_tools(messages)
+
+        if strategy == "sequential" and returned < len(project_names):
+            return ModelResponse(parts=[ToolCallPart.from_raw_args("get_tasks_by_project_name", {"project_name": project_names[returned]})])
+
+        if strategy == "parallel" and not returned:
+            return ModelResponse(parts=[ToolCallPart.from_raw_args("get_tasks_by_project_name", {"project_name": name}) for name in project_names])
+
+        if strategy == "batch" and not returned:
+            return ModelResponse(parts=[ToolCallPart.from_raw_args("get_tasks_for_projects", {"project_names": project_names, "limit": AsyncAsanaTools.MAX_PAGE_SIZE})])
+
+        return ModelResponse(parts=[TextPart("Here is how the projects are doing.")])
+
+    return FunctionModel(respond)
+
+async def main_async(arguments: argparse.Namespace):
+    tools = AsyncAsanaTools(AsanaStorage.memory("asana_batch_tools_bench"))
+    asana = tools.__asana__
+    project_names = [f"Project {i}" for i in range(max(arguments.projects))]
+    for name in project_names:
+        project = asana.create_project(name)
+        asana.create_tasks(project.id, [AsanaTaskCreate(f"{name} task {i}", "2025-01-01") for i in range(arguments.tasks)])
+
+    print(f"{'projects':>8}  {'strategy':<12}{'model requests':>16}{'tool calls':>12}{'tool bytes':>12}{'wall s':>10}")
+    for count in arguments.projects:
+        for strategy in ("sequential", "parallel", "batch"):
+            agent = Agent(scripted_model(strategy, project_names[:count], arguments.latency), tools=tools.get_tools())
+
+            start = time.perf_counter()
+            result = await agent.run("How are these projects doing?")
+            elapsed = time.perf_counter() - start
+
+            messages = result.all_messages()
+            tool_bytes = sum(len(to_json(part.content)) for message in messages if isinstance(message, ModelRequest) for part in message.parts if isinstance(part, ToolReturnPart))
+            print(f"{count:>8}  {strategy:<12}{result.usage().requests:>16}{returned_tools(messages):>12}{tool_bytes:>12,}{elapsed:>10.2f}")
+
+    tools.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Counts the model requests of multi-project questions with and without the batch tools.")
+    parser.add_argument("--projects", type=int, nargs="+", default=[2, 5, 10], help="number of projects in the question")
+    parser.add_argument("--tasks", type=int, default=10, help="tasks per project")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated seconds per model request")
+    asyncio.run(main_async(parser.parse_args()))
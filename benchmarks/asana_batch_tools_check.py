@@ -0,0 +1,101 @@
+# NOTES:
+# Checks that the batch tools return the same tasks as the single-call tools they replace, as the model receives them (the encoded tool results).
+# - get_tasks_for_projects (every page) against get_tasks_by_project_name (every page) for each of the projects, with and without filters,
+#   with mixed-case, repeated, unknown and shared project names and with small and large pages.
+# - get_tasks_by_ids against get_task_by_id for each of the ids, in order, with mixed-case, repeated and unknown ids.
+# - The batch pages may order the tasks differently, so the tasks are compared as sets of rows; get_tasks_by_ids is compared in order.
+# - Exits with status 1 when a case doesn't match.
+# To run: python benchmarks/asana_batch_tools_check.py
+
+import os
+import random
+import sys
+from asana_data_generator import STATUSES, AsanaDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaStorage, AsanaTaskCreate
+from asana_tools import AsanaTools
+
+def rows(result) -> list[dict]:
+    # the encoded results are a columnar page or list, a single object, or None
+    if result is None:
+        return []
+
+    if isinstance(result, list):
+        return result
+
+    if "columns" in result:
+        return [dict(zip(result["columns"], row)) for row in result["rows"]]
+
+    return [result]
+
+def all_pages(tool, *args, **kwargs) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        page = tool(*args, cursor=cursor, **kwargs)
+        items += rows(page)
+        if not (cursor := page.get("next_cursor")):
+            return items
+
+def as_set(items: list[dict]) -> set[tuple]:
+    return {tuple(sorted(item.items())) for item in items}
+
+def check(name: str, batch: list[dict], single: list[dict], ordered: bool = False) -> bool:
+    passed = batch == single if ordered else (len(batch) == len(single) and as_set(batch) == as_set(single))
+    print(f"{'ok' if passed else 'FAIL':<6}{name:<80}{len(batch):>6} batch{len(single):>6} single")
+    if not passed:
+        for item in sorted(as_set(batch) ^ as_set(single))[:5]:
+            print(f"      {'only batch' if item in as_set(batch) else 'only single'}: {dict(item)}")
+
+    return passed
+
+def main() -> int:
+    tools = AsanaTools(AsanaStorage.memory("asana_batch_tools_check"))
+    dataset = AsanaDataGenerator(tools.__asana__).generate(12, 60)
+    tool = {tool.name: tool.function for tool in tools.get_tools()}
+    rng = random.Random(7)
+    names = [project.name for project in dataset.projects]
+
+    # project names are not unique: a second project named like another one (in other case) must not add its tasks to the batch
+    twin = tools.__asana__.create_project(names[6].upper())
+    tools.__asana__.create_tasks(twin.id, [AsanaTaskCreate(f"Twin task {i}", "2025-05-01") for i in range(10)])
+
+    project_cases = {
+        "one project": [names[0]],
+        "three projects": names[1:4],
+        "every project": names,
+        "mixed case, repeated and unknown names": [names[4].upper(), names[5].lower(), names[4], "No Such Project"],
+        "a name shared by two projects": [names[6], names[7]],
+    }
+    filter_cases = {
+        "": {},
+        ", status filter": {"status": STATUSES[1]},
+        ", due date range": {"due_from": "2025-03-01", "due_to": "2025-08-31"},
+        ", status and due date": {"status": STATUSES[2], "due_to": "2025-06-30"},
+    }
+
+    passed = True
+    for case, project_names in project_cases.items():
+        for suffix, filters in filter_cases.items():
+            for limit in (7, AsanaTools.MAX_PAGE_SIZE):
+                batch = all_pages(tool["get_tasks_for_projects"], project_names, limit=limit, **filters)
+                distinct = {name.casefold(): name for name in project_names}.values()
+                single = [task for name in distinct for task in all_pages(tool["get_tasks_by_project_name"], name, limit=limit, **filters)]
+                passed &= check(f"get_tasks_for_projects: {case}{suffix}, limit {limit}", batch, single)
+
+    ids = [task.id for task in rng.sample(dataset.task_sample, 40)]
+    id_cases = {
+        "40 ids": ids,
+        "mixed case, repeated and unknown ids": [ids[0].upper(), ids[1], ids[0], "no-such-task", ids[2].upper(), ids[1]],
+        "no ids": [],
+    }
+    for case, task_ids in id_cases.items():
+        batch = rows(tool["get_tasks_by_ids"](task_ids))
+        distinct = {task_id.casefold(): task_id for task_id in task_ids}.values()
+        single = [task for task_id in distinct for task in rows(tool["get_task_by_id"](task_id))]
+        passed &= check(f"get_tasks_by_ids: {case}", batch, single, ordered=True)
+
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# NOTES:
+# Checks that change feed consumers stay in sync while the change log is pruned under them.
+# - A writer creates, renames, updates and deletes tasks and projects in rounds, and prunes the change log every `--prune-every` rounds.
+# - Consumers keep a copy of the tasks from changes_since, each one reads at its own pace (some fall behind the pruned range).
+#   A 'purge' or 'prune' entry makes a consumer resync: reload its copy and carry on from the entry's seq.
+# - A second Asana_Api on the same database serves project lookups from its cache, synced from the change log.
+# - Checks: every consumer's copy matches the database, the ones behind the pruned range resynced, the change log is trimmed,
+#   and the second Asana_Api's cache sees every project as it is stored.
+# - Exits with status 1 when a check fails.
+# To run: python benchmarks/asana_change_log_check.py --rounds 30
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from asana_data_generator import STATUSES, AsanaDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import Asana_Api, AsanaProjectUpdate, AsanaStorage
+
+class Consumer:
+    def __init__(self, api: Asana_Api, every: int):
+        self.api = api
+        self.every = every
+        self.seq = 0
+        self.tasks = {}
+        self.resyncs = 0
+        self.resync(0)
+
+    def resync(self, seq: int):
+        self.seq, self.resyncs = seq, self.resyncs + 1
+        self.tasks = {task.id: (task.project_id, task.name, task.due_date, task.status) for project in self.api.get_projects() for task in self.api.get_tasks_by_project_id(project.id)}
+
+    def read(self, round: int):
+        if round % self.every:
+            return
+
+        while changes := self.api.changes_since(self.seq, limit=100):
+            for change in changes:
+                if change.entity == "*":
+                    # the changes before this entry are gone (or the data was purged), only a reload catches up
+                    self.resync(change.seq)
+                    continue
+
+                self.seq = change.seq
+                if change.entity != "task":
+                    continue
+
+                if change.op == "delete":
+                    self.tasks.pop(change.entity_id, None)
+                else:
+                    payload = change.payload
+                    self.tasks[change.entity_id] = (payload["project_id"], payload["name"], payload["due_date"], payload["status"])
+
+def stored_tasks(api: Asana_Api) -> dict:
+    return {task.id: (task.project_id, task.name, task.due_date, task.status) for project in api.get_projects() for task in api.get_tasks_by_project_id(project.id)}
+
+def main(arguments: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        storage = AsanaStorage.file(os.path.join(directory, "asana.db"))
+        api = Asana_Api(storage)
+        other = Asana_Api(storage, project_cache_sync_interval=0)
+        try:
+            dataset = AsanaDataGenerator(api).generate(5, 40)
+            rng = random.Random(11)
+            consumers = [Consumer(api, every) for every in (1, 3, arguments.prune_every * 2)]
+            projects = list(dataset.projects)
+            pruned = 0
+
+            for round in range(1, arguments.rounds + 1):
+                index = rng.randrange(len(projects))
+                project = projects[index]
+                other.get_project_by_id(project.id)
+                other.get_project_by_name(project.name)
+
+                tasks = api.get_tasks_by_project_id(project.id)
+                for task in rng.sample(tasks, min(5, len(tasks))):
+                    api.update_task_status(task.id, rng.choice(STATUSES))
+                api.create_task(project.id, f"Change log {round}", "2025-02-01")
+                if tasks and round % 4 == 0:
+                    api.delete_task_by_id(tasks[0].id)
+                if round % 5 == 0:
+                    api.update_project(project.id, AsanaProjectUpdate(f"{project.name} {round}"))
+                    projects[index] = api.get_project_by_id(project.id)
+
+                for consumer in consumers:
+                    consumer.read(round)
+
+                if round % arguments.prune_every == 0:
+                    # keep the last `--keep` entries, the first consumer has just read up to the last one
+                    pruned += api.prune_changes(consumers[0].seq - arguments.keep + 1)
+
+            for consumer in consumers:
+                consumer.read(0)
+
+            stored = stored_tasks(api)
+            log = api.changes_since(0, limit=1_000_000)
+            checks = {
+                **{f"consumer reading every {consumer.every} rounds matches the database ({consumer.resyncs - 1} resyncs)": consumer.tasks == stored for consumer in consumers},
+                "a consumer behind the pruned range resynced": consumers[-1].resyncs > 1,
+                "the consumers keeping up never resynced": consumers[0].resyncs == 1,
+                f"change log trimmed ({pruned:,} entries pruned, {len(log):,} left)": pruned > 0 and log[0].op == "prune",
+                "the second Asana_Api's project cache matches the database": all(
+                    other.get_project_by_id(project.id) == project and other.get_project_by_name(project.name) == project for project in api.get_projects()
+                ),
+            }
+        finally:
+            other.close()
+            api.close()
+
+    for name, passed in checks.items():
+        print(f"{'ok' if passed else 'FAIL':<6}{name}")
+
+    return 0 if all(checks.values()) else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks change feed consumers while the change log is pruned.")
+    parser.add_argument("--rounds", type=int, default=30, help="write rounds")
+    parser.add_argument("--prune-every", type=int, default=5, help="rounds between prunes")
+    parser.add_argument("--keep", type=int, default=10, help="change log entries kept by each prune")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+# NOTES:
+# Before/after benchmark of the connection handling behind the Asana tool-call paths.
+# - "per-call" opens a new sqlite3 connection for every statement (how Asana_Api used to work).
+# - "pooled" reuses the per-thread WAL connection owned by SqlLiteConnectionPool.
+# - Each mode runs on its own freshly seeded file, so "per-call" keeps SQLite's default rollback journal instead of inheriting WAL from the pool.
+# To run: python benchmarks/asana_connection_bench.py [iterations]
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import SqlLiteClient, SqlLiteConnectionPool
+
+SCHEMA = (
+    "CREATE TABLE Project (Id TEXT COLLATE NOCASE PRIMARY KEY, Name TEXT COLLATE NOCASE NOT NULL)",
+    "CREATE TABLE Task (Id TEXT COLLATE NOCASE PRIMARY KEY, ProjectId TEXT NOT NULL, Name TEXT COLLATE NOCASE NOT NULL, DueDate TEXT, Status TEXT)",
+)
+
+# the statements issued by the most frequently used tools
+TOOL_PATHS = {
+    "get_project_by_name": lambda ids: ("SELECT Id, Name FROM Project WHERE Name = ?", ("Project",), False),
+    "get_task_by_id": lambda ids: ("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE Id = ?", (ids["task"],), False),
+    "create_task": lambda ids: ("INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?, ?)", (str(uuid.uuid4()), ids["project"], "Task", "2025-01-01", "Not Started"), True),
+    "update_task_status": lambda ids: ("UPDATE Task SET Status = ? WHERE Id = ?", ("Completed", ids["task"]), True),
+}
+
+def seed(db_name: str) -> dict:
+    client = SqlLiteClient(db_name)
+    try:
+        ids = {"project": str(uuid.uuid4()), "task": str(uuid.uuid4())}
+        for sql in SCHEMA:
+            client.execute(sql)
+        client.execute("INSERT INTO Project (Id, Name) VALUES (?, ?)", (ids["project"], "Project"))
+        client.execute("INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?, ?)", (ids["task"], ids["project"], "Task", "2025-01-01", "Not Started"))
+        client.commit()
+        return ids
+    finally:
+        client.close()
+
+def run(get_client, statement, ids: dict, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sql, parameters, is_write = statement(ids)
+        client = get_client()
+        try:
+            client.execute(sql, parameters)
+            if is_write:
+                client.commit()
+            else:
+                client.fetchone()
+        finally:
+            client.close()
+
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+def main(iterations: int):
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'tool path':<22}{'per-call (us)':>15}{'pooled (us)':>15}{'speedup':>10}")
+        for name, statement in TOOL_PATHS.items():
+            per_call_db = os.path.join(directory, f"{name}_per_call.db")
+            ids = seed(per_call_db)
+            per_call = run(lambda: SqlLiteClient(per_call_db), statement, ids, iterations)
+
+            pooled_db = os.path.join(directory, f"{name}_pooled.db")
+            ids = seed(pooled_db)
+            pool = SqlLiteConnectionPool(pooled_db)
+            try:
+                pooled = run(pool.client, statement, ids, iterations)
+            finally:
+                pool.close()
+
+            print(f"{name:<22}{per_call:>15.1f}{pooled:>15.1f}{per_call / pooled:>9.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,64 @@
+# NOTES:
+# Synthetic data generator for the mock Asana backend.
+# - Everything is created through the public Asana_Api (create_project / create_tasks), so seeding exercises the real write paths.
+# - The data is deterministic for a given seed, so results from different commits are comparable.
+
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import Asana_Api, AsanaProject, AsanaTask, AsanaTaskCreate
+
+STATUSES = ("Not Started", "In Progress", "Completed")
+WORDS = (
+    "invoice", "budget", "review", "release", "design", "deploy", "meeting", "report", "customer", "contract",
+    "hiring", "onboarding", "security", "audit", "roadmap", "migration", "backup", "support", "marketing", "launch",
+)
+
+@dataclass
+class AsanaDataset:
+    projects: list[AsanaProject] = field(default_factory=list)
+    task_sample: list[AsanaTask] = field(default_factory=list)
+    total_tasks: int = 0
+
+class AsanaDataGenerator:
+    def __init__(self, api: Asana_Api, seed: int = 42, sample_size: int = 10_000, batch_size: int = 10_000):
+        self.__api = api
+        self.__random = random.Random(seed)
+        self.__sample_size = sample_size
+        self.__batch_size = batch_size
+
+    def task_name(self) -> str:
+        return " ".join(self.__random.choices(WORDS, k=3)).capitalize()
+
+    def due_date(self) -> str:
+        return str(date(2025, 1, 1) + timedelta(days=self.__random.randrange(365)))
+
+    def generate(self, projects: int, tasks_per_project: int) -> AsanaDataset:
+        dataset = AsanaDataset()
+        for i in range(projects):
+            project = self.__api.create_project(f"Project {i}")
+            dataset.projects.append(project)
+
+            remaining = tasks_per_project
+            while remaining > 0:
+                count = min(remaining, self.__batch_size)
+                tasks = self.__api.create_tasks(project.id, [
+                    AsanaTaskCreate(self.task_name(), self.due_date(), self.__random.choice(STATUSES)) for _ in range(count)
+                ])
+                self.__sample(dataset, tasks)
+                remaining -= count
+
+        return dataset
+
+    def __sample(self, dataset: AsanaDataset, tasks: list[AsanaTask]):
+        # reservoir sampling keeps a uniform sample of task ids without holding millions of tasks in memory
+        for task in tasks:
+            dataset.total_tasks += 1
+            if len(dataset.task_sample) < self.__sample_size:
+                dataset.task_sample.append(task)
+            elif (index := self.__random.randrange(dataset.total_tasks)) < self.__sample_size:
+                dataset.task_sample[index] = task
@@ -0,0 +1,86 @@
+# NOTES:
+# Measures the latency of model responses that contain several tool calls, the way pydantic_ai runs them (Tool.run per call).
+# - "sequential": the calls are awaited one after another.
+# - "sync tools": AsanaTools gathered concurrently, pydantic_ai runs sync tools on the default executor, writes included.
+# - "async tools": AsyncAsanaTools gathered concurrently, reads on the bounded pool and writes serialized on the writer thread.
+# The database is a WAL file, so the pooled connections can read in parallel.
+# To run: python benchmarks/asana_parallel_tools_bench.py --size 50x2000 --iterations 50
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pydantic_ai.messages import ToolCallPart
+from pydantic_ai.tools import RunContext, Tool
+from pydantic_ai.usage import Usage
+from asana_data_generator import STATUSES, WORDS, AsanaDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaStorage
+from asana_tools import AsanaTools, AsyncAsanaTools
+
+def responses(dataset, rng: random.Random) -> dict[str, list[tuple[str, dict]]]:
+    tasks = lambda count: rng.sample(dataset.task_sample, count)
+    projects = lambda count: rng.sample(dataset.projects, count)
+    return {
+        "4 x get_task_by_id": [("get_task_by_id", {"task_id": task.id}) for task in tasks(4)],
+        "4 x search_tasks": [("search_tasks", {"query": " ".join(rng.sample(WORDS, 2))}) for _ in range(4)],
+        "4 x get_tasks_by_project_name": [("get_tasks_by_project_name", {"project_name": project.name, "limit": 200}) for project in projects(4)],
+        "4 x get_project_summaries": [("get_project_summaries", {"project_name": project.name}) for project in projects(4)],
+        "4 reads + 4 writes": [("get_project_summaries", {"project_name": project.name}) for project in projects(4)]
+            + [("update_task_status", {"task_id": task.id, "status": rng.choice(STATUSES)}) for task in tasks(4)],
+    }
+
+async def run_response(tools: dict[str, Tool], calls: list[tuple[str, dict]], concurrent: bool) -> float:
+    context = RunContext(deps=None, model=None, usage=Usage(), prompt="")
+    parts = [ToolCallPart.from_raw_args(name, args) for name, args in calls]
+
+    start = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*(tools[part.tool_name].run(part, context) for part in parts))
+    else:
+        for part in parts:
+            await tools[part.tool_name].run(part, context)
+
+    return (time.perf_counter() - start) * 1000
+
+async def main_async(arguments: argparse.Namespace):
+    projects, tasks_per_project = map(int, arguments.size.split("x"))
+    with tempfile.TemporaryDirectory() as directory:
+        storage = AsanaStorage.file(os.path.join(directory, "asana.db"))
+        sync_tools = AsanaTools(storage)
+        async_tools = AsyncAsanaTools(storage, arguments.workers)
+        dataset = AsanaDataGenerator(sync_tools.__asana__, arguments.seed).generate(projects, tasks_per_project)
+
+        modes = {
+            "sequential": ({tool.name: tool for tool in async_tools.get_tools()}, False),
+            "sync tools": ({tool.name: tool for tool in sync_tools.get_tools()}, True),
+            "async tools": ({tool.name: tool for tool in async_tools.get_tools()}, True),
+        }
+
+        rng = random.Random(arguments.seed)
+        print(f"{projects * tasks_per_project:,} tasks, {arguments.workers} workers, median ms per response over {arguments.iterations} responses")
+        print(f"{'response':<32}" + "".join(f"{mode:>14}" for mode in modes))
+        for name in responses(dataset, rng):
+            timings = {mode: [] for mode in modes}
+            for _ in range(arguments.iterations):
+                calls = responses(dataset, rng)[name]
+                for mode, (tools, concurrent) in modes.items():
+                    timings[mode].append(await run_response(tools, calls, concurrent))
+
+            print(f"{name:<32}" + "".join(f"{statistics.median(values):>14.2f}" for values in timings.values()))
+
+        async_tools.close()
+        sync_tools.__asana__.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the latency of multi-tool responses, sequential and concurrent.")
+    parser.add_argument("--size", default="50x2000", help="dataset size as <projects>x<tasks per project>")
+    parser.add_argument("--iterations", type=int, default=50, help="responses per case and mode")
+    parser.add_argument("--workers", type=int, default=4, help="AsyncAsanaTools read pool size")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main_async(parser.parse_args()))
@@ -0,0 +1,86 @@
+# NOTES:
+# Checks that the Asana_Api lookups are served by the secondary indexes of the schema migrations instead of full table scans.
+# - Every case calls the real Asana_Api method with SQLite statement tracing on, then runs EXPLAIN QUERY PLAN on each traced statement,
+#   so the check follows the SQL the API actually issues.
+# - A case passes when each of its expected indexes shows up as a "USING (COVERING) INDEX" row and no plan row scans Project or Task.
+# - Exits with status 1 on the first failing case, so it can gate a change like the benchmarks are run.
+# To run: python benchmarks/asana_query_plan_check.py
+
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from asana_data_generator import AsanaDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import Asana_Api, AsanaStorage
+
+# a table scan of Project or Task (by name or by the aliases the queries use)
+TABLE_SCAN = re.compile(r"\bSCAN (Project|Task|p|t)\b(?! USING)")
+
+# case -> (call, expected indexes); a tuple of names means any of them
+CASES = {
+    "get_project_by_name": (lambda api, project, task: api.get_project_by_name(project.name), ["IX_Project_Name"]),
+    "get_task_by_name": (lambda api, project, task: api.get_task_by_name(project.name, task.name), ["IX_Task_ProjectId_Name"]),
+    "get_tasks_by_project_id": (lambda api, project, task: api.get_tasks_by_project_id(project.id), [("IX_Task_ProjectId_Name", "IX_Task_ProjectId_Id")]),
+    "get_tasks_by_project_name": (lambda api, project, task: api.get_tasks_by_project_name(project.name), ["IX_Project_Name", ("IX_Task_ProjectId_Name", "IX_Task_ProjectId_Id")]),
+    "get_tasks_page_by_project_id": (lambda api, project, task: api.get_tasks_page_by_project_id(project.id, limit=50), ["IX_Task_ProjectId_Id"]),
+    "get_tasks_page_by_project_names": (lambda api, project, task: api.get_tasks_page_by_project_names([project.name, "No Such Project"], limit=50), ["IX_Project_Name", "IX_Task_ProjectId_Id"]),
+    "get_task_status_counts": (lambda api, project, task: api.get_task_status_counts(project.name), ["IX_Project_Name", ("IX_Task_ProjectId_Name", "IX_Task_ProjectId_Id")]),
+    "delete_task_by_name": (lambda api, project, task: api.delete_task_by_name(project.name, task.name), ["IX_Task_ProjectId_Name"]),
+}
+
+# query shapes checked on their own: no Asana_Api method filters tasks by status and due date alone, and the project cache 
+# reads the change log only once every sync interval
+RAW_CASES = {
+    "Task (Status, DueDate) filter": ("SELECT Id FROM Task WHERE Status = ? AND DueDate <= ?", ("In Progress", "2025-06-30"), ["IX_Task_Status_DueDate"]),
+    "project cache sync": (
+        "SELECT Seq, Entity, EntityId, json_extract(Payload, '$.name') FROM ChangeLog WHERE Entity IN ('project', '*') AND Seq > ? ORDER BY Seq LIMIT ?", 
+        (0, 257), ["IX_ChangeLog_Entity_Seq"]
+    ),
+}
+
+def query_plan(connection: sqlite3.Connection, sql: str, parameters=()) -> list[str]:
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+def check(name: str, plans: list[str], expected: list) -> bool:
+    # one plan row per line, the expected indexes must all be used and no table may be scanned
+    used = set(re.findall(r"USING (?:COVERING )?INDEX (\w+)", "\n".join(plans)))
+    missing = [index for index in expected if not used & set(index if isinstance(index, tuple) else (index,))]
+    scans = [plan for plan in plans if TABLE_SCAN.search(plan)]
+    passed = not missing and not scans
+    print(f"{'ok' if passed else 'FAIL':<6}{name:<34}{', '.join(sorted(used)) or '-'}")
+    for index in missing:
+        print(f"      missing index: {' or '.join(index) if isinstance(index, tuple) else index}")
+    for plan in scans:
+        print(f"      table scan: {plan}")
+
+    return passed
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "asana.db")
+        with Asana_Api(AsanaStorage.file(database)) as api, sqlite3.connect(database) as explain:
+            dataset = AsanaDataGenerator(api).generate(20, 200)
+            project, task = dataset.projects[3], next(task for task in dataset.task_sample if task.project_id == dataset.projects[3].id)
+
+            # traces the statements Asana_Api runs on this thread's pooled connection
+            statements = []
+            api._Asana_Api__pool.connection().set_trace_callback(statements.append)
+
+            passed = True
+            for name, (call, expected) in CASES.items():
+                api.project_cache.clear()
+                statements.clear()
+                call(api, project, task)
+                plans = [plan for sql in statements if re.match(r"\s*(SELECT|UPDATE|DELETE)\b", sql, re.IGNORECASE) for plan in query_plan(explain, sql)]
+                passed &= check(name, plans, expected)
+
+            for name, (sql, parameters, expected) in RAW_CASES.items():
+                passed &= check(name, query_plan(explain, sql, parameters), expected)
+
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
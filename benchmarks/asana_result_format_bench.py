@@ -0,0 +1,48 @@
+# NOTES:
+# Measures the size of the Asana tool results as the model sees them (serialized to JSON the same way pydantic_ai does).
+# - "verbose" is the original encoding: one object per row, every key repeated, with its link.
+# - "columnar" is the AsanaTools default: column names once, rows as lists, no links.
+# - "projected" is columnar with only the id, name and status fields.
+# Tokens are estimated as bytes / 4.
+# To run: python benchmarks/asana_result_format_bench.py
+
+import os
+import sys
+from pydantic_core import to_json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaStorage, AsanaTaskCreate
+from asana_result_format import AsanaResultFormat
+from asana_tools import AsanaTools
+
+FORMATS = {
+    "verbose": AsanaResultFormat.VERBOSE,
+    "columnar": AsanaResultFormat(),
+    "projected": AsanaResultFormat(fields=("id", "name", "status")),
+}
+
+def main():
+    asana = AsanaTools(AsanaStorage.memory("asana_result_format_bench")).__asana__
+    project = asana.create_project("Project")
+    asana.create_tasks(project.id, [AsanaTaskCreate(f"Task {i}", "2025-01-01") for i in range(AsanaTools.MAX_PAGE_SIZE)])
+
+    task_id = asana.get_tasks_page_by_project_id(project.id, limit=1).items[0].id
+    calls = (
+        ("get_task_by_id", (task_id,)),
+        ("get_tasks_by_project_name", (project.name, None, 50)),
+        ("get_tasks_by_project_name", (project.name, None, 200)),
+    )
+
+    print(f"{'tool result':<28}{'rows':>6}  {'format':<12}{'bytes':>10}{'~tokens':>10}{'saved':>8}")
+    for name, args in calls:
+        baseline = None
+        for format_name, result_format in FORMATS.items():
+            # call the tool function the agent gets, including its result encoding
+            tools = AsanaTools(AsanaStorage.memory("asana_result_format_bench"), result_format).get_tools()
+            function = next(tool.function for tool in tools if tool.name == name)
+            size = len(to_json(function(*args)))
+            baseline = baseline or size
+            print(f"{name:<28}{args[-1] if len(args) > 1 else 1:>6}  {format_name:<12}{size:>10,}{size // 4:>10,}{1 - size / baseline:>8.0%}")
+
+if __name__ == "__main__":
+    main()
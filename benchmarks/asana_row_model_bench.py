@@ -0,0 +1,73 @@
+# NOTES:
+# Memory/throughput benchmark of the Asana row models on large task listings.
+# - "dict rows" maps sqlite3.Row by column name into a regular dataclass and stores the link f-string (the original mapper).
+# - "slotted rows" maps plain row tuples positionally into the slotted AsanaTask, links are derived on access.
+# To run: python benchmarks/asana_row_model_bench.py [rows]
+
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from itertools import starmap
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaTask
+
+@dataclass
+class DictTask:
+    id: str
+    project_id: str
+    name: str
+    due_date: str
+    status: str
+    link: str
+
+def map_dict_rows(rows: list[sqlite3.Row]) -> list[DictTask]:
+    return [
+        DictTask(
+            id=row["Id"],
+            project_id=row["ProjectId"],
+            name=row["Name"],
+            due_date=row["DueDate"],
+            status=row["Status"],
+            link=f"https://example.com/tasks/{row['Id']}")
+        for row in rows
+    ]
+
+def map_slotted_rows(rows: list[tuple]) -> list[AsanaTask]:
+    return list(starmap(AsanaTask, rows))
+
+def seed(conn: sqlite3.Connection, rows: int):
+    project_id = str(uuid.uuid4())
+    conn.execute("CREATE TABLE Task (Id TEXT COLLATE NOCASE PRIMARY KEY, ProjectId TEXT NOT NULL, Name TEXT COLLATE NOCASE NOT NULL, DueDate TEXT, Status TEXT)")
+    conn.executemany(
+        "INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?, ?)",
+        ((str(uuid.uuid4()), project_id, f"Task {i}", "2025-01-01", "Not Started") for i in range(rows)))
+    conn.commit()
+
+def measure(conn: sqlite3.Connection, row_factory, mapper) -> tuple[float, float]:
+    conn.row_factory = row_factory
+    tracemalloc.start()
+    start = time.perf_counter()
+    entities = mapper(conn.execute("SELECT Id, ProjectId, Name, DueDate, Status FROM Task").fetchall())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return elapsed, peak / 1024 / 1024
+
+def main(rows: int):
+    conn = sqlite3.connect(":memory:")
+    seed(conn, rows)
+
+    print(f"{rows} rows")
+    print(f"{'mapper':<15}{'time (ms)':>12}{'rows/sec':>14}{'peak (MB)':>12}")
+    for name, row_factory, mapper in (("dict rows", sqlite3.Row, map_dict_rows), ("slotted rows", None, map_slotted_rows)):
+        elapsed, peak = measure(conn, row_factory, mapper)
+        print(f"{name:<15}{elapsed * 1000:>12.1f}{rows / elapsed:>14,.0f}{peak:>12.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
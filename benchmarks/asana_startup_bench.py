@@ -0,0 +1,53 @@
+# NOTES:
+# Measures the startup cost of the Asana tools: the import in a fresh process, and the construction that Streamlit repeats on every rerun.
+# - "uncached": the tool schemas are rebuilt and the database is opened and migrated on construction (the previous behavior,
+#   emulated by clearing the schema cache and making a first call).
+# - "cached": what a rerun costs now, the schemas come from the process cache and the database is left alone until the first tool call.
+# To run: python benchmarks/asana_startup_bench.py --iterations 50
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous'))
+sys.path.append(DIRECTORY)
+from asana_api import AsanaStorage
+from asana_tools import AsanaTools, AsyncAsanaTools
+
+def import_ms(module: str) -> float:
+    code = f"import sys, time; sys.path.append({DIRECTORY!r}); start = time.perf_counter(); import {module}; print((time.perf_counter() - start) * 1000)"
+    return float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+
+def construct_ms(storage: AsanaStorage, cached: bool) -> float:
+    start = time.perf_counter()
+    if not cached:
+        AsanaTools.__schemas__.clear()
+
+    tools = AsyncAsanaTools(storage)
+    if not cached:
+        tools.__asana__.get_project_id("")
+
+    elapsed = (time.perf_counter() - start) * 1000
+    tools.close()
+    return elapsed
+
+def main(arguments: argparse.Namespace):
+    imports = [import_ms("asana_tools") for _ in range(arguments.imports)]
+    print(f"import asana_tools (fresh process): median {statistics.median(imports):.1f} ms over {arguments.imports} runs")
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = AsanaStorage.file(os.path.join(directory, "asana.db"))
+        print(f"{'AsyncAsanaTools()':<20}{'median ms':>12}{'p95 ms':>10}")
+        for mode, cached in (("uncached", False), ("cached", True)):
+            timings = sorted(construct_ms(storage, cached) for _ in range(arguments.iterations))
+            print(f"{mode:<20}{statistics.median(timings):>12.2f}{timings[int(len(timings) * 0.95) - 1]:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the import and construction (Streamlit rerun) cost of the Asana tools.")
+    parser.add_argument("--iterations", type=int, default=50, help="constructions per mode")
+    parser.add_argument("--imports", type=int, default=5, help="fresh process imports")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+# NOTES:
+# Measures what the agent has to pull into its context to answer "how many tasks are overdue per project?".
+# - "listing tools": get_projects + get_tasks_by_project_name for every project, paging through all the results (the model counts).
+# - "summary tool": a single get_project_summaries call (the database counts).
+# Tokens are estimated as serialized bytes / 4, the tool results are serialized the same way pydantic_ai does (to JSON).
+# To run: python benchmarks/asana_summary_bench.py [projects] [tasks_per_project]
+
+import os
+import sys
+import time
+from pydantic_core import to_json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from asana_api import AsanaStorage, AsanaTaskCreate
+from asana_tools import AsanaTools
+
+def listing_tools(tools: AsanaTools) -> list:
+    results = []
+    cursor = None
+    projects = []
+    while True:
+        page = tools.get_projects(cursor, AsanaTools.MAX_PAGE_SIZE)
+        results.append(page)
+        projects.extend(page.items)
+        if not (cursor := page.next_cursor):
+            break
+
+    for project in projects:
+        cursor = None
+        while True:
+            page = tools.get_tasks_by_project_name(project.name, cursor, AsanaTools.MAX_PAGE_SIZE)
+            results.append(page)
+            if not (cursor := page.next_cursor):
+                break
+
+    return results
+
+def summary_tool(tools: AsanaTools) -> list:
+    return [tools.get_project_summaries()]
+
+def measure(name: str, tools: AsanaTools, strategy):
+    start = time.perf_counter()
+    results = strategy(tools)
+    elapsed = time.perf_counter() - start
+    size = sum(len(to_json(result)) for result in results)
+    print(f"{name:<16}{len(results):>12}{size:>14,}{size // 4:>14,}{elapsed * 1000:>12.1f}")
+
+def main(projects: int, tasks_per_project: int):
+    tools = AsanaTools(AsanaStorage.memory("asana_summary_bench"))
+    asana = tools.__asana__
+    for i in range(projects):
+        project = asana.create_project(f"Project {i}")
+        asana.create_tasks(project.id, [
+            AsanaTaskCreate(f"Task {j}", f"2025-{j % 12 + 1:02d}-01", ("Not Started", "In Progress", "Completed")[j % 3]) 
+            for j in range(tasks_per_project)
+        ])
+
+    print(f"{projects} projects x {tasks_per_project} tasks")
+    print(f"{'strategy':<16}{'tool calls':>12}{'bytes':>14}{'~tokens':>14}{'db (ms)':>12}")
+    measure("listing tools", tools, listing_tools)
+    measure("summary tool", tools, summary_tool)
+    asana.close()
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500)
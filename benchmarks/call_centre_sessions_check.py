@@ -0,0 +1,108 @@
+# NOTES:
+# Checks CallCentre.ask_async with a SessionManager, end to end through the pydantic_graph graph.
+# The agents' model is scripted with pydantic_ai's FunctionModel (no API key is used): the supervisor routes prompts mentioning "bill"
+# to the billing specialist and answers the others itself, the specialist answers with the prompt it got.
+# - `--sessions` sessions run `--turns` turns each, one after the other within a session and the sessions concurrently on one event loop.
+# - Checks: every turn answers its own prompt, each session's stored history holds exactly its own prompts (in order, none interleaved),
+#   the usage of each session is stored, and a turn on a long history (`--history` messages) stays fast, the graph doesn't copy the history.
+# - Exits with status 1 when a check fails.
+# To run: python benchmarks/call_centre_sessions_check.py --sessions 8 --turns 10
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from message_window_bench import turn_messages
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/supervisor')))
+os.environ.setdefault("OPENAI_API_KEY", "not-used")
+import call_centre_multi_agent
+from call_centre_multi_agent import CallCentre
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.message_store import MessageStore
+from _utils.session_manager import SessionManager
+
+def last_prompt(messages: list[ModelMessage]) -> str:
+    return next(part.content for part in reversed(messages[-1].parts) if isinstance(part, UserPromptPart))
+
+async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    await asyncio.sleep(0.001)
+    prompt = last_prompt(messages)
+    if info.result_tools:
+        specialist = "billing" if "bill" in prompt else "general"
+        return ModelResponse(parts=[ToolCallPart.from_raw_args(info.result_tools[0].name, {"specialist": specialist, "general_response": f"general: {prompt}"})])
+
+    return ModelResponse(parts=[TextPart(f"billing: {prompt}")])
+
+async def session_turns(call_centre: CallCentre, session_id: str, turns: int) -> list[bool]:
+    answered = []
+    for turn in range(turns):
+        prompt = f"{session_id} turn {turn}" + (" about my bill" if turn % 2 else "")
+        response = await call_centre.ask_async(prompt, session_id)
+        answered.append(response.response.endswith(prompt))
+
+    return answered
+
+async def main_async(arguments: argparse.Namespace) -> int:
+    call_centre_multi_agent.open_ai_model = FunctionModel(respond)
+    session_ids = [f"session-{number}" for number in range(arguments.sessions)]
+
+    with tempfile.TemporaryDirectory() as directory, MessageStore(os.path.join(directory, "messages.db")) as store:
+        manager = SessionManager(store, MessageWindow.DEFAULT)
+        call_centre = CallCentre(manager)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(session_turns(call_centre, session_id, arguments.turns) for session_id in session_ids), return_exceptions=True)
+        elapsed = time.perf_counter() - start
+        failures = [result for result in results if isinstance(result, BaseException)]
+        manager.close()
+
+        stored_prompts, stored_usage = {}, {}
+        for session_id in session_ids:
+            history = MessageHistory.load(store, session_id)
+            stored_prompts[session_id] = [part.content for message in history.get_all_messages() for part in message.parts if isinstance(part, UserPromptPart)]
+            stored_usage[session_id] = store.load_usage(session_id).requests
+
+        # a turn without sessions, on a long history: the graph snapshots the state at every step
+        call_centre = CallCentre()
+        for turn in range(arguments.history // 4):
+            call_centre.state.history.extend(turn_messages(turn))
+
+        turn_start = time.perf_counter()
+        await call_centre.ask_async("One more question about my bill")
+        turn_ms = (time.perf_counter() - turn_start) * 1000
+
+    # the supervisor and the specialist both add the prompt to the history, so a routed turn stores it twice
+    expected_prompts = {
+        session_id: [prompt for turn in range(arguments.turns) for prompt in ([f"{session_id} turn {turn} about my bill"] * 2 if turn % 2 else [f"{session_id} turn {turn}"])]
+        for session_id in session_ids
+    }
+    # every turn asks the supervisor, and the specialist on every other turn
+    expected_usage = arguments.turns + arguments.turns // 2
+    checks = {
+        f"no failed turns ({len(failures)} failed)": not failures,
+        "every turn answers its own prompt": not failures and all(all(result) for result in results),
+        "stored histories hold each session's own prompts, in order": all(stored_prompts[session_id] == expected_prompts[session_id] for session_id in session_ids),
+        f"stored usage of each session ({expected_usage} requests)": all(requests == expected_usage for requests in stored_usage.values()),
+        f"turn on a {len(call_centre.state.history.get_all_messages()):,} message history {turn_ms:.1f}ms < {arguments.max_turn_ms:.0f}ms": turn_ms < arguments.max_turn_ms,
+    }
+
+    print(f"{arguments.sessions} sessions x {arguments.turns} turns in {elapsed:.2f}s")
+    for name, passed in checks.items():
+        print(f"{'ok' if passed else 'FAIL':<6}{name}")
+    for failure in failures[:5]:
+        print(f"      {type(failure).__name__}: {failure}")
+
+    return 0 if all(checks.values()) else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks CallCentre.ask_async with a SessionManager, with a scripted model.")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=10, help="turns per session")
+    parser.add_argument("--history", type=int, default=2_000, help="messages in the history of the long-history turn")
+    parser.add_argument("--max-turn-ms", type=float, default=50, help="worst acceptable time of the long-history turn in ms")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
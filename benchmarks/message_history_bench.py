@@ -0,0 +1,122 @@
+# NOTES:
+# Compares the original MessageHistory (kept below as BaselineMessageHistory) with the indexed one at large history sizes.
+# - "turn": what the call-centre graph does per agent run, at the given history size.
+#     baseline: assign(all_messages) + remove_part_kind("system-prompt"), which rescans every message
+#     indexed:  extend(new_messages) + get_messages_without("system-prompt"), which only touches the new messages
+# - "append": appending a TextPart (the baseline re-introspects the part unions on every call).
+# - "find tool calls": collecting every tool-call part, a full scan vs the part kind index.
+# To run: python benchmarks/message_history_bench.py --sizes 1000 10000
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Annotated, List, Self, get_args, get_origin
+from pydantic_ai.messages import (
+    ModelMessage, ModelRequest, ModelRequestPart, ModelResponse, ModelResponsePart,
+    SystemPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+)
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from _utils.message_history import MessageHistory
+
+class BaselineMessageHistory:
+    def __init__(self):
+        self.__messages: List[ModelMessage] = []
+
+    def assign(self, messages: List[ModelMessage]) -> Self:
+        self.__messages = messages
+        return self
+
+    def append(self, part: ModelMessage) -> Self:
+        def get_raw_types(annotated_type):
+            return get_args(get_args(annotated_type)[0]) if get_origin(annotated_type) is Annotated else get_args(annotated_type)
+
+        model_request_parts = get_raw_types(ModelRequestPart)
+        model_response_parts = get_raw_types(ModelResponsePart)
+
+        if isinstance(part, model_request_parts):
+            self.__messages.append(ModelRequest([part]))
+            return self
+
+        if isinstance(part, model_response_parts):
+            self.__messages.append(ModelResponse([part]))
+            return self
+
+        raise TypeError(f"Invalid part type: {type(part).__name__}.")
+
+    def remove_part_kind(self, part_kind:str) -> Self:
+        for item in self.__messages:
+            parts = item.parts.copy()
+            for part in parts:
+                if part.part_kind == part_kind:
+                    item.parts.remove(part)
+
+        return self
+
+    def get_all_messages(self) -> List[ModelMessage]:
+        return self.__messages
+
+def turn_messages(turn: int) -> list[ModelMessage]:
+    # a user prompt answered with a tool call, the tool return and the final text, like an agent run
+    return [
+        ModelRequest([SystemPromptPart("You are a call centre agent."), UserPromptPart(f"Question {turn}")]),
+        ModelResponse([ToolCallPart.from_raw_args("lookup", {"query": f"Question {turn}"})]),
+        ModelRequest([ToolReturnPart("lookup", f"Answer {turn}")]),
+        ModelResponse([TextPart(f"Here is the answer to question {turn}")]),
+    ]
+
+def history_messages(size: int) -> list[ModelMessage]:
+    messages = []
+    for turn in range(size // 4):
+        messages.extend(turn_messages(turn))
+
+    return messages
+
+def timed(function, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    return statistics.median(timings)
+
+def bench_size(size: int, iterations: int) -> dict[str, tuple[float, float]]:
+    new_turn = turn_messages(size)
+    baseline, indexed = BaselineMessageHistory(), MessageHistory()
+    baseline.assign(history_messages(size))
+    indexed.assign(history_messages(size)).get_messages_without("system-prompt")
+
+    def baseline_turn():
+        # pydantic_ai hands back the history it was given plus the new messages
+        baseline.assign(baseline.get_all_messages() + turn_messages(0)).remove_part_kind("system-prompt")
+
+    def indexed_turn():
+        indexed.extend(turn_messages(0)).get_messages_without("system-prompt")
+
+    results = {
+        "turn": (timed(baseline_turn, iterations), timed(indexed_turn, iterations)),
+        "append": (timed(lambda: baseline.append(TextPart("ok")), iterations), timed(lambda: indexed.append(TextPart("ok")), iterations)),
+        "find tool calls": (
+            timed(lambda: [part for message in baseline.get_all_messages() for part in message.parts if part.part_kind == "tool-call"], iterations),
+            timed(lambda: indexed.get_parts("tool-call"), iterations),
+        ),
+    }
+
+    # both must leave out the same parts
+    assert [len(message.parts) for message in baseline.get_all_messages()[:len(new_turn)]] == [len(message.parts) for message in indexed.get_messages_without("system-prompt")[:len(new_turn)]]
+    return results
+
+def main(arguments: argparse.Namespace):
+    print(f"{'messages':>9}  {'operation':<18}{'baseline us':>14}{'indexed us':>14}{'speedup':>10}")
+    for size in arguments.sizes:
+        for operation, (baseline, indexed) in bench_size(size, arguments.iterations).items():
+            print(f"{size:>9,}  {operation:<18}{baseline:>14.1f}{indexed:>14.1f}{baseline / indexed:>9.0f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares the original and the indexed MessageHistory.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000], help="history sizes in messages")
+    parser.add_argument("--iterations", type=int, default=50, help="timed calls per operation and size")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+# NOTES:
+# Measures MessageHistory serialization on multi-MB histories: wall time and peak Python memory (tracemalloc) per operation.
+# Times are taken with tracemalloc on, which slows the pure Python paths (json.loads/json.dumps) the most.
+# - "3-pass to_json": the original messages_to_json, dump_json -> json.loads -> json.dumps(indent).
+# - "to_json": one pydantic pass with the indent, decoded to str.
+# - "to_json_bytes": the same pass, kept as bytes.
+# - "write_json": streamed to a file, 256 messages at a time.
+# - "validate_json": ModelMessagesTypeAdapter.validate_json, eager, the baseline load.
+# - "from_json": the whole history, validated message by message.
+# - "from_json 20 turns": only the last 20 turns validated.
+# To run: python benchmarks/message_serialization_bench.py --turns 1000 4000
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pydantic_ai.messages import ModelMessagesTypeAdapter
+from message_window_bench import turn_messages
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from _utils.message_history import MessageHistory
+
+def measure(function) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+def main(arguments: argparse.Namespace):
+    print(f"{'turns':>7}{'JSON MB':>9}  {'operation':<22}{'ms':>10}{'peak MB':>10}")
+    for turns in arguments.turns:
+        history = MessageHistory()
+        for turn in range(turns):
+            history.extend(turn_messages(turn))
+
+        data = history.to_json_bytes()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.json")
+
+            def write_json():
+                with open(path, "wb") as stream:
+                    history.write_json(stream)
+
+            operations = {
+                "3-pass to_json": lambda: json.dumps(json.loads(ModelMessagesTypeAdapter.dump_json(history.get_all_messages())), indent=2),
+                "to_json": lambda: history.to_json(indent=2),
+                "to_json_bytes": lambda: history.to_json_bytes(indent=2),
+                "write_json": write_json,
+                "validate_json": lambda: ModelMessagesTypeAdapter.validate_json(data),
+                "from_json": lambda: MessageHistory.from_json(data),
+                "from_json 20 turns": lambda: MessageHistory.from_json(data, last_turns=20),
+            }
+
+            for name, operation in operations.items():
+                elapsed, peak = measure(operation)
+                print(f"{turns:>7}{len(data) / 1024 / 1024:>9.1f}  {name:<22}{elapsed:>10.1f}{peak:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures MessageHistory serialization time and peak memory on large histories.")
+    parser.add_argument("--turns", type=int, nargs="+", default=[1_000, 4_000], help="history sizes in turns (~4 messages and ~3KB of JSON each)")
+    main(parser.parse_args())
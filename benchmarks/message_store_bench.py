@@ -0,0 +1,55 @@
+# NOTES:
+# Measures what persisting a session costs per turn as it grows, and what loading it back costs.
+# - "to_json": serializing the whole history each turn (what saving with MessageHistory.to_json would cost).
+# - "rewrite": replacing the whole session in the MessageStore each turn.
+# - "save": MessageHistory.save(), which only appends the turn's new messages.
+# - "load" / "load 20 turns": loading the whole session, or only its last 20 turns (plus the system prompts).
+# To run: python benchmarks/message_store_bench.py --turns 10 100 500
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from message_window_bench import turn_messages
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from _utils.message_history import MessageHistory
+from _utils.message_store import MessageStore
+
+def timed(function, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+def main(arguments: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as directory, MessageStore(os.path.join(directory, "messages.db")) as store:
+        print(f"{'turns':>7}{'messages':>10}{'to_json ms':>12}{'rewrite ms':>12}{'save ms':>10}{'load ms':>10}{'load 20 turns ms':>18}")
+        for turns in arguments.turns:
+            session_id = f"session-{turns}"
+            history = MessageHistory(store=store, session_id=session_id)
+            for turn in range(turns):
+                history.extend(turn_messages(turn)).save()
+
+            messages = list(history.get_all_messages())
+            to_json = timed(history.to_json, arguments.iterations)
+            rewrite = timed(lambda: store.replace(f"{session_id}-rewrite", messages), arguments.iterations)
+
+            def save():
+                history.extend(turn_messages(turns)).save()
+
+            saved = timed(save, arguments.iterations)
+            load = timed(lambda: store.load(session_id), arguments.iterations)
+            load_tail = timed(lambda: store.load(session_id, last_turns=20), arguments.iterations)
+            print(f"{turns:>7}{len(messages):>10,}{to_json:>12.2f}{rewrite:>12.2f}{saved:>10.2f}{load:>10.2f}{load_tail:>18.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the per-turn cost of persisting a session and the cost of loading it.")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 500], help="session lengths in turns")
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per operation")
+    main(parser.parse_args())
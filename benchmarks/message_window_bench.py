@@ -0,0 +1,66 @@
+# NOTES:
+# Measures the prompt size sent per turn over a long session, with and without a MessageWindow.
+# Each turn is a user prompt, a tool call, a ~1.5KB tool return and a text answer, like an Asana agent run.
+# Sizes are the history serialized with ModelMessagesTypeAdapter (what gets stored), tokens are the local TokenEstimator estimate.
+# "summary" uses a toy summarizer that keeps the first words of every dropped user prompt, a real one would ask a model.
+# To run: python benchmarks/message_window_bench.py --turns 200
+
+import argparse
+import os
+import sys
+import time
+from pydantic_ai.messages import (
+    ModelMessage, ModelMessagesTypeAdapter, ModelRequest, ModelResponse,
+    SystemPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+)
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.token_estimator import TokenEstimator
+
+def turn_messages(turn: int) -> list[ModelMessage]:
+    rows = [[f"task-{turn}-{row}", f"Review the budget report {row}", "2025-01-01", "In Progress"] for row in range(30)]
+    return [
+        ModelRequest(([SystemPromptPart("You are a personal assistant to help manage project tasks.")] if turn == 0 else []) + [UserPromptPart(f"Question {turn}: which tasks are still in progress?")]),
+        ModelResponse([ToolCallPart.from_raw_args("get_tasks_by_project_name", {"project_name": f"Project {turn % 7}", "status": "In Progress"})]),
+        ModelRequest([ToolReturnPart("get_tasks_by_project_name", {"columns": ["id", "name", "due_date", "status"], "rows": rows, "next_cursor": None})]),
+        ModelResponse([TextPart(f"There are {len(rows)} tasks in progress in Project {turn % 7}. " * 4)]),
+    ]
+
+def summarize(previous: str | None, dropped: list[ModelMessage]) -> str:
+    prompts = [part.content[:40] for message in dropped for part in message.parts if part.part_kind == "user-prompt"]
+    return "\n".join(filter(None, [previous, *prompts]))
+
+WINDOWS = {
+    "full": None,
+    "last 20 turns": MessageWindow(max_turns=20),
+    "8k tokens": MessageWindow.DEFAULT,
+    "4k + summary": MessageWindow(max_tokens=4_000, summarize=summarize),
+}
+
+def main(arguments: argparse.Namespace):
+    checkpoints = {turn for turn in (10, 50, 100, 200, arguments.turns) if turn <= arguments.turns}
+    print(f"{'window':<16}" + "".join(f"{f'turn {turn} KB':>14}" for turn in sorted(checkpoints)) + f"{'session MB':>12}{'~tokens sent':>14}{'us/call':>10}")
+    for name, window in WINDOWS.items():
+        history = MessageHistory(window)
+        sizes, total_bytes, total_tokens, elapsed = {}, 0, 0, 0.0
+        for turn in range(1, arguments.turns + 1):
+            start = time.perf_counter()
+            prompt = history.get_prompt_messages()
+            elapsed += time.perf_counter() - start
+
+            size = len(ModelMessagesTypeAdapter.dump_json(prompt))
+            total_bytes += size
+            total_tokens += TokenEstimator.estimate_messages(prompt)
+            if turn in checkpoints:
+                sizes[turn] = size
+
+            history.extend(turn_messages(turn - 1))
+
+        print(f"{name:<16}" + "".join(f"{sizes[turn] / 1024:>14.1f}" for turn in sorted(checkpoints))
+              + f"{total_bytes / 1024 / 1024:>12.1f}{total_tokens:>14,}{elapsed / arguments.turns * 1_000_000:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the prompt size per turn over a long session, with and without a MessageWindow.")
+    parser.add_argument("--turns", type=int, default=200, help="turns in the session")
+    main(parser.parse_args())
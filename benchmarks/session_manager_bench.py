@@ -0,0 +1,48 @@
+# NOTES:
+# Measures the SessionManager serving many sessions: messages kept in memory, peak Python memory (tracemalloc), evictions and rehydrations.
+# Each turn picks a session (a few hot sessions get most of the turns), adds a turn to its history and releases it (saved to the store).
+# "unbounded" keeps every session in memory, like one MessageHistory per session in a dict.
+# To run: python benchmarks/session_manager_bench.py --sessions 200 --turns 2000 --caps 500 2000
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from message_window_bench import turn_messages
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from _utils.message_history import MessageWindow
+from _utils.message_store import MessageStore
+from _utils.session_manager import SessionManager
+
+def main(arguments: argparse.Namespace):
+    print(f"{'cap':>10}{'sessions':>10}{'messages':>10}{'peak MB':>10}{'evictions':>11}{'rehydrations':>14}{'ms/turn':>9}")
+    for cap in [None, *arguments.caps]:
+        randomizer = random.Random(42)
+        with tempfile.TemporaryDirectory() as directory, MessageStore(os.path.join(directory, "messages.db")) as store:
+            manager = SessionManager(store, MessageWindow.DEFAULT, max_messages=cap or sys.maxsize, last_turns=MessageWindow.DEFAULT.max_turns)
+            tracemalloc.start()
+            start = time.perf_counter()
+            for turn in range(arguments.turns):
+                session_id = f"session-{int(randomizer.paretovariate(1.2)) % arguments.sessions}"
+                with manager.session(session_id) as session:
+                    session.history.extend(turn_messages(turn))
+
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            stats = manager.stats()
+            manager.close()
+            print(f"{cap or 'unbounded':>10}{stats['sessions']:>10}{stats['messages']:>10,}{peak / 1024 / 1024:>10.1f}"
+                  f"{stats['evictions']:>11,}{stats['rehydrations']:>14,}{elapsed / arguments.turns * 1000:>9.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures SessionManager memory and eviction behaviour over many sessions.")
+    parser.add_argument("--sessions", type=int, default=200, help="distinct session ids")
+    parser.add_argument("--turns", type=int, default=2_000, help="turns served across all the sessions")
+    parser.add_argument("--caps", type=int, nargs="+", default=[500, 2_000], help="max_messages values to compare")
+    main(parser.parse_args())
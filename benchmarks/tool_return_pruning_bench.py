@@ -0,0 +1,90 @@
+# NOTES:
+# Measures the prompt tokens saved by pruning stale tool returns, replaying a session turn by turn and estimating every prompt sent.
+# The session is a recorded history (the JSON of MessageHistory.to_json/write_json) given with --session, or a generated Asana-like one:
+# each turn calls get_projects or get_tasks_by_project_name (for one of a few projects) and gets a ~1.5KB tool return back.
+# Every prompt is checked for the provider's pairing rule: each tool call id has a tool return (or retry prompt) and the reverse.
+# To run: python benchmarks/tool_return_pruning_bench.py --turns 100
+#         python benchmarks/tool_return_pruning_bench.py --session history.json
+
+import argparse
+import dataclasses
+import os
+import sys
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../design_patterns/full_autonomous')))
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.token_estimator import TokenEstimator
+from asana_tools import AsanaTools
+
+def generated_session(turns: int) -> list[list[ModelMessage]]:
+    session = []
+    for turn in range(turns):
+        call_id = f"call-{turn}"
+        if turn % 3 == 0:
+            call = ToolCallPart.from_raw_args("get_projects", {}, call_id)
+            content = {"columns": ["id", "name"], "rows": [[f"project-{row}", f"Project {row}"] for row in range(40)]}
+        else:
+            project_name = f"Project {turn % 4}"
+            call = ToolCallPart.from_raw_args("get_tasks_by_project_name", {"project_name": project_name}, call_id)
+            content = {"columns": ["id", "name", "due_date", "status"], "rows": [[f"task-{row}", f"Review the budget report {row}", "2025-01-01", "In Progress"] for row in range(30)]}
+
+        session.append([
+            ModelRequest([UserPromptPart(f"Question {turn}: what is going on in the projects?")]),
+            ModelResponse([call]),
+            ModelRequest([ToolReturnPart(call.tool_name, content, call_id)]),
+            ModelResponse([TextPart(f"Here is what I found for question {turn}.")]),
+        ])
+
+    return session
+
+def recorded_session(path: str) -> list[list[ModelMessage]]:
+    # split at the user prompts, one list of messages per turn
+    with open(path, "rb") as stream:
+        session = []
+        for message in MessageHistory.iter_json(stream.read()):
+            if not session or any(part.part_kind == "user-prompt" for part in message.parts):
+                session.append([])
+
+            session[-1].append(message)
+
+    return session
+
+def check_pairing(messages: list[ModelMessage]):
+    calls = {part.tool_call_id for message in messages for part in message.parts if part.part_kind == "tool-call" and part.tool_call_id}
+    answers = {part.tool_call_id for message in messages for part in message.parts if part.part_kind in ("tool-return", "retry-prompt") and part.tool_call_id}
+    if calls != answers:
+        raise AssertionError(f"Unpaired tool call ids: {sorted(calls ^ answers)}")
+
+WINDOWS = {
+    "full": MessageWindow(),
+    "stub after 5 turns": MessageWindow(stub_tool_returns_after=5),
+    "drop superseded": MessageWindow(drop_superseded_tool_calls=True, droppable_tools=AsanaTools.READ_TOOLS),
+    "stub + drop": MessageWindow(stub_tool_returns_after=5, drop_superseded_tool_calls=True, droppable_tools=AsanaTools.READ_TOOLS),
+    "8k window": MessageWindow(max_turns=20, max_tokens=8_000),
+    "8k window + pruning": dataclasses.replace(MessageWindow.DEFAULT, drop_superseded_tool_calls=True, droppable_tools=AsanaTools.READ_TOOLS),
+}
+
+def main(arguments: argparse.Namespace):
+    session = recorded_session(arguments.session) if arguments.session else generated_session(arguments.turns)
+    print(f"{len(session)} turns, {sum(len(turn) for turn in session):,} messages")
+    print(f"{'policy':<22}{'~tokens sent':>14}{'saved':>8}{'last prompt ~tokens':>21}{'last prompt msgs':>18}")
+    baseline = None
+    for name, window in WINDOWS.items():
+        history = MessageHistory(window)
+        total, prompt = 0, []
+        for messages in session:
+            prompt = history.get_prompt_messages()
+            check_pairing(prompt)
+            total += TokenEstimator.estimate_messages(prompt)
+            history.extend(messages)
+
+        baseline = baseline or total
+        print(f"{name:<22}{total:>14,}{1 - total / baseline:>8.0%}{TokenEstimator.estimate_messages(prompt):>21,}{len(prompt):>18}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the prompt tokens saved by the MessageWindow tool return pruning.")
+    parser.add_argument("--turns", type=int, default=100, help="turns of the generated session")
+    parser.add_argument("--session", help="a recorded history, as written by MessageHistory.to_json or write_json")
+    main(parser.parse_args())
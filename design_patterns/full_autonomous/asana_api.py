@@ -2,45 +2,163 @@
 # - This script uses a **mocked Asana API**.
 # - Disclaimer: I am not entirely sure how the actual Asana API looks or functions. The implementation here is purely fictional and created as an example.
 
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import os
+import queue
+import re
 import sqlite3
-from typing import Any, Self
+import string
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Self
 import uuid
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import starmap
+from pydantic_core import SchemaSerializer, core_schema
 
-@dataclass
+# NOTE:
+# - Row models are slotted (no per-instance __dict__) and their fields follow the column order of the SELECTs,
+#   so a row tuple maps positionally: AsanaTask(*row).
+# - Links are derived on access instead of being built and stored for every row.
+@dataclass(slots=True)
 class AsanaProject:
     id: str
     name: str
-    link: str
 
-@dataclass
+    @property
+    def link(self) -> str:
+        return f"https://example.com/projects/{self.id}"
+
+@dataclass(slots=True)
 class AsanaTask:
     id: str
     project_id: str
     name: str
     due_date: str
     status: str
-    link: str
+
+    @property
+    def link(self) -> str:
+        return f"https://example.com/tasks/{self.id}"
+
+# NOTE:
+# - pydantic serializes a dataclass by its fields only, so serializing a row as-is (e.g. a tool result without an AsanaResultFormat)
+#   would leave the link property out. The rows carry a serializer (the pydantic-core hook) that adds it back, only computed when serialized.
+def serialize_with_link(row: AsanaProject | AsanaTask) -> dict[str, Any]:
+    return {**{name: getattr(row, name) for name in row.__dataclass_fields__}, "link": row.link}
+
+for row_model in (AsanaProject, AsanaTask):
+    row_model.__pydantic_serializer__ = SchemaSerializer(core_schema.any_schema(serialization=core_schema.plain_serializer_function_ser_schema(serialize_with_link)))
+
+@dataclass(slots=True)
+class AsanaStatusCount:
+    project_id: str
+    project_name: str
+    status: str
+    count: int
+
+@dataclass(slots=True)
+class AsanaProjectSummary:
+    project_id: str
+    project_name: str
+    total: int
+    completed: int
+    overdue: int
+    next_due_date: str
+    done_ratio: float
+
+@dataclass(slots=True)
+class AsanaChange:
+    seq: int
+    entity: str
+    op: str
+    entity_id: str
+    payload: dict
+    created_at: str
 
+@dataclass
+class AsanaPage:
+    items: list[Any]
+    next_cursor: str = None
+
+# NOTE: update models are partial, fields left as None are not changed.
 @dataclass
 class AsanaProjectUpdate:
-    name: str
+    name: str = None
 
 @dataclass
 class AsanaTaskUpdate:
+    name: str = None
+    due_date: str = None
+    status: str = None
+
+@dataclass
+class AsanaTaskCreate:
     name: str
-    due_date: str
+    due_date: str = None
+    status: str = "Not Started"
+
+@dataclass
+class AsanaTaskStatusUpdate:
+    task_id: str
     status: str
     
+@dataclass(frozen=True)
+class AsanaStorage:
+    # NOTE:
+    # - Where an Asana_Api keeps its data: a database file, an in-memory database or a file per workspace.
+    # - In-memory databases live as long as the Asana_Api that opened them (tests, benchmarks). They use the memdb VFS (SQLite 3.36+),
+    #   shared by name between the pool's connections with the same locking as a file, so readers and the writer wait on busy_timeout
+    #   instead of failing. (Shared-cache `mode=memory` databases use table locks that busy_timeout doesn't retry, even readers fail.)
+    # - There is no WAL in memory: a reader waits for a writer's commit instead of running alongside it.
+    # - A file per workspace lets workspaces write concurrently instead of all queueing on the single SQLite write lock.
+    database: str = "asana.db"
+    uri: bool = False
+
+    @staticmethod
+    def file(path: str = "asana.db") -> "AsanaStorage":
+        return AsanaStorage(path)
+
+    @staticmethod
+    def memory(name: str = "asana") -> "AsanaStorage":
+        return AsanaStorage(f"file:/{name}?vfs=memdb", uri=True)
+
+    @staticmethod
+    def workspace(workspace_key: str, directory: str = ".") -> "AsanaStorage":
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", workspace_key or ""):
+            raise ValueError(f"Invalid workspace key: {workspace_key!r}. Expected letters, digits, '_' or '-'.")
+
+        # case-folded: on case-insensitive filesystems (macOS, Windows) "Acme" and "acme" would silently share a file, so keys
+        # are case-insensitive on every platform instead
+        return AsanaStorage(os.path.join(directory, f"asana_{workspace_key.lower()}.db"))
+
+
 class SqlLiteClient:
-    def __init__(self, dbName: str):
-        self.__conn = sqlite3.connect(dbName)
-        self.__conn.row_factory = sqlite3.Row
+    def __init__(self, dbName: str = None, connection: sqlite3.Connection = None):
+        # a client either owns a private connection (dbName) or borrows a pooled one (connection)
+        self.__owns_conn = connection is None
+        self.__conn = sqlite3.connect(dbName) if self.__owns_conn else connection
         self.__cursor = self.__conn.cursor()        
         
     def execute(self, sql: str,  parameters = (), /) -> Self:
         self.__cursor.execute(sql, parameters)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters, /) -> Self:
+        self.__cursor.executemany(sql, seq_of_parameters)
+        return self
+
+    @property
+    def rowcount(self) -> int:
+        return self.__cursor.rowcount
         
     def fetchone(self) -> Any:
         return self.__cursor.fetchone()
@@ -52,25 +170,322 @@ class SqlLiteClient:
         self.__conn.commit()
         
     def close(self):
-        self.__conn.close()
+        self.__cursor.close()
+
+        if self.__owns_conn:
+            self.__conn.close()
+        elif self.__conn.in_transaction:
+            # never hand uncommitted work back to the pool
+            self.__conn.rollback()
         
 
-class Asana_Api:
-    def __init__(self):
-        self.__create_tables()
-    
-    def __create_tables(self):
-        client = SqlLiteClient("asana.db")
+class SqlLiteConnectionPool:
+    # NOTE:
+    # - sqlite3 connections can't be shared across threads, so the pool keeps one long-lived connection per thread.
+    # - WAL lets readers run alongside the single writer and `synchronous=NORMAL` is durable enough in WAL mode.
+    # - A thread's connection is only referenced by its thread-local handle, so it is closed and released when the thread exits
+    #   (e.g. a Streamlit script run, an executor shut down) instead of piling up until close().
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -16000",
+        "PRAGMA mmap_size = 134217728",
+    )
+
+    class Handle:
+        __slots__ = ("conn", "__weakref__")
+
+        def __init__(self, conn: sqlite3.Connection):
+            self.conn = conn
+
+    def __init__(self, dbName: str, uri: bool = False):
+        self.__db_name = dbName
+        self.__uri = uri
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__connections: set[sqlite3.Connection] = set()
+        self.__closed = False
+
+    @property
+    def size(self) -> int:
+        with self.__lock:
+            return len(self.__connections)
+
+    def connection(self) -> sqlite3.Connection:
+        handle = getattr(self.__local, "handle", None)
+        if handle is not None:
+            return handle.conn
+
+        with self.__lock:
+            if self.__closed:
+                raise sqlite3.ProgrammingError("Cannot use a closed connection pool.")
+
+            # check_same_thread is off only so that close() (and the release at thread exit) can close every thread's connection
+            conn = sqlite3.connect(self.__db_name, check_same_thread=False, uri=self.__uri)
+            for pragma in SqlLiteConnectionPool.PRAGMAS:
+                conn.execute(pragma)
+
+            self.__connections.add(conn)
+            self.__local.handle = SqlLiteConnectionPool.Handle(conn)
+            weakref.finalize(self.__local.handle, self.__release, conn)
+            return conn
+
+    def client(self) -> SqlLiteClient:
+        return SqlLiteClient(connection=self.connection())
+
+    def close(self):
+        with self.__lock:
+            self.__closed = True
+            for conn in self.__connections:
+                conn.close()
+            self.__connections.clear()
+
+    def __release(self, conn: sqlite3.Connection):
+        with self.__lock:
+            self.__connections.discard(conn)
+
+        conn.close()
+        
+
+@dataclass(frozen=True)
+class AsanaGroupCommit:
+    max_latency_ms: float = 2.0
+    max_batch: int = 256
+
+
+class GroupCommitWriter:
+    # NOTE:
+    # - Write-behind queue: callers hand their write operation to a single writer thread and block until it is committed.
+    # - The writer groups whatever arrives within `max_latency_ms` of the first queued write (up to `max_batch`) into one transaction,
+    #   so N concurrent writes cost one commit (and one fsync) instead of N.
+    # - Each operation runs in its own SAVEPOINT, so a failing write is rolled back and reported to its caller alone.
+    # - Callers only return once the group is committed, so acknowledgements stay durable. The writer's connection uses
+    #   synchronous=FULL since the fsync is amortized over the whole group.
+    def __init__(self, pool: SqlLiteConnectionPool, options: AsanaGroupCommit):
+        self.__pool = pool
+        self.__options = options
+        self.__queue: queue.Queue[tuple[Callable[[SqlLiteClient], Any], Future] | None] = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name="asana-writer", daemon=True)
+        self.__thread.start()
+
+    def submit(self, operation: Callable[[SqlLiteClient], Any]) -> Any:
+        if not self.__thread.is_alive():
+            raise sqlite3.ProgrammingError("Cannot write through a closed group-commit writer.")
+
+        future = Future()
+        self.__queue.put((operation, future))
+        return future.result()
+
+    def close(self):
+        self.__queue.put(None)
+        self.__thread.join()
+
+    def __run(self):
+        self.__pool.connection().execute("PRAGMA synchronous = FULL")
+        stopping = False
+        while not stopping:
+            item = self.__queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.__options.max_latency_ms / 1000
+            while len(batch) < self.__options.max_batch:
+                try:
+                    item = self.__queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            self.__flush(batch)
+
+    def __flush(self, batch: list[tuple[Callable[[SqlLiteClient], Any], Future]]):
+        client = self.__pool.client()
         try:
-            client.execute("""
+            outcomes = []
+            client.execute("BEGIN IMMEDIATE")
+            for operation, _ in batch:
+                client.execute("SAVEPOINT write_operation")
+                try:
+                    outcomes.append((operation(client), None))
+                except Exception as e:
+                    client.execute("ROLLBACK TO write_operation")
+                    outcomes.append((None, e))
+                finally:
+                    client.execute("RELEASE write_operation")
+
+            client.commit()
+        except Exception as e:
+            outcomes = [(None, e)] * len(batch)
+        finally:
+            client.close()
+
+        for (_, future), (result, error) in zip(batch, outcomes):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+class ProjectCache:
+    # NOTE:
+    # - A bounded LRU read-through cache of projects keyed by id, plus a name -> id index for the name lookups.
+    # - Id and name keys are folded like SQLite's NOCASE collation (ASCII only), so cache hits match what the query would return.
+    # - Writers invalidate entries; `version` changes on every invalidation so a reader that raced with a writer 
+    #   doesn't put a stale row back.
+    # - Writes made through the same Asana_Api invalidate it right away. Writes made elsewhere (another Asana_Api on the same database,
+    #   another process) are picked up from the change log at most every `sync_interval` seconds: the lookups in between are served
+    #   without touching the database, so a project changed elsewhere can be served stale for up to `sync_interval` seconds.
+    # - A sync invalidates exactly the projects the log shows as changed since the last one; a purge, a pruned log or more changes 
+    #   than the cache holds drop the whole cache.
+    # - Callers always get copies, so mutating a returned project never leaks into the cache.
+    NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+    def __init__(self, max_size: int = 256, sync_interval: float = 1.0):
+        self.__max_size = max_size
+        self.__sync_interval = sync_interval
+        self.__lock = threading.Lock()
+        self.__by_id: OrderedDict[str, AsanaProject] = OrderedDict()
+        self.__id_by_name: dict[str, str] = {}
+        self.__change_seq: int = None
+        self.__synced_at: float = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.syncs = 0
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def change_seq(self) -> int:
+        return self.__change_seq
+
+    def sync_due(self) -> bool:
+        synced_at = self.__synced_at
+        return synced_at is None or time.monotonic() - synced_at >= self.__sync_interval
+
+    def sync(self, change_seq: int, changes: list[tuple[str, str]] = ()):
+        # changes: the (id, name) of the projects changed up to change_seq, None drops the whole cache
+        with self.__lock:
+            self.__synced_at = time.monotonic()
+            if self.__change_seq is not None and change_seq <= self.__change_seq:
+                return
+
+            if self.__change_seq is not None:
+                self.syncs += 1
+                if changes is None:
+                    self.__clear()
+                else:
+                    self.version += 1
+                    for project_id, project_name in changes:
+                        self.__discard_id(ProjectCache.__key(project_id))
+                        if project_name is not None:
+                            self.__by_id.pop(self.__id_by_name.pop(ProjectCache.__key(project_name), None), None)
+
+            self.__change_seq = change_seq
+
+    def get_by_id(self, project_id: str) -> AsanaProject:
+        with self.__lock:
+            key = ProjectCache.__key(project_id)
+            entity = self.__by_id.get(key)
+            if entity is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.__by_id.move_to_end(key)
+            return dataclasses.replace(entity)
+
+    def get_by_name(self, project_name: str) -> AsanaProject:
+        with self.__lock:
+            key = self.__id_by_name.get(ProjectCache.__key(project_name))
+            if key is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.__by_id.move_to_end(key)
+            return dataclasses.replace(self.__by_id[key])
+
+    def put(self, entity: AsanaProject, version: int, by_name: bool = False):
+        with self.__lock:
+            if version != self.version:
+                return
+
+            key = ProjectCache.__key(entity.id)
+            self.__by_id.pop(key, None)
+            self.__by_id[key] = dataclasses.replace(entity)
+            if by_name:
+                self.__id_by_name[ProjectCache.__key(entity.name)] = key
+
+            while len(self.__by_id) > self.__max_size:
+                evicted_key, evicted = self.__by_id.popitem(last=False)
+                self.__discard_name(evicted.name, evicted_key)
+
+    def invalidate_id(self, project_id: str):
+        with self.__lock:
+            self.version += 1
+            self.__discard_id(ProjectCache.__key(project_id))
+
+    def invalidate_name(self, project_name: str):
+        with self.__lock:
+            self.version += 1
+            key = self.__id_by_name.pop(ProjectCache.__key(project_name), None)
+            if key is not None:
+                self.__by_id.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__clear()
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return {"size": len(self.__by_id), "hits": self.hits, "misses": self.misses, "syncs": self.syncs}
+
+    def __clear(self):
+        self.version += 1
+        self.__by_id.clear()
+        self.__id_by_name.clear()
+
+    def __discard_id(self, key: str):
+        entity = self.__by_id.pop(key, None)
+        if entity is not None:
+            self.__discard_name(entity.name, key)
+
+    def __discard_name(self, project_name: str, key: str):
+        name_key = ProjectCache.__key(project_name)
+        if self.__id_by_name.get(name_key) == key:
+            del self.__id_by_name[name_key]
+
+    @staticmethod
+    def __key(value: str) -> str:
+        return value.translate(ProjectCache.NOCASE) if value else value
+
+
+class Asana_Api:
+    # NOTE:
+    # - Schema migrations, applied in order. The index of the last applied migration is kept in `PRAGMA user_version`.
+    # - Migration 1 is the original schema (IF NOT EXISTS), so existing asana.db files (user_version 0) are upgraded in place.
+    # - Never edit a migration that has shipped, append a new one instead.
+    MIGRATIONS: list[tuple[str, ...]] = [
+        # 1: Project and Task tables
+        (
+            """
             CREATE TABLE IF NOT EXISTS Project (
                 Id TEXT COLLATE NOCASE PRIMARY KEY,
                 Name TEXT COLLATE NOCASE NOT NULL
             )
-            """)        
-
-            # Create the Task table
-            client.execute("""
+            """,
+            """
             CREATE TABLE IF NOT EXISTS Task (
                 Id TEXT COLLATE NOCASE PRIMARY KEY,
                 ProjectId TEXT NOT NULL,
@@ -79,107 +494,309 @@ class Asana_Api:
                 Status TEXT,
                 FOREIGN KEY (ProjectId) REFERENCES Project (Id)
             )
-            """)
+            """,
+        ),
+        # 2: secondary indexes for the name/project lookups and status/due date filters
+        (
+            "CREATE INDEX IF NOT EXISTS IX_Project_Name ON Project (Name)",
+            "CREATE INDEX IF NOT EXISTS IX_Task_ProjectId_Name ON Task (ProjectId, Name)",
+            "CREATE INDEX IF NOT EXISTS IX_Task_Status_DueDate ON Task (Status, DueDate)",
+        ),
+        # 3: keyset pagination of a project's tasks (WHERE ProjectId = ? AND Id > ? ORDER BY Id)
+        (
+            "CREATE INDEX IF NOT EXISTS IX_Task_ProjectId_Id ON Task (ProjectId, Id)",
+        ),
+        # 4: full-text search over task names, an external content FTS5 table kept in sync with Task by triggers
+        #    (keyed by Task's implicit rowid, which is stable as long as the database is never VACUUMed)
+        (
+            "CREATE VIRTUAL TABLE IF NOT EXISTS TaskSearch USING fts5(Name, content='Task', tokenize='porter unicode61')",
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Search_Insert AFTER INSERT ON Task BEGIN
+                INSERT INTO TaskSearch (rowid, Name) VALUES (new.rowid, new.Name);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Search_Delete AFTER DELETE ON Task BEGIN
+                INSERT INTO TaskSearch (TaskSearch, rowid, Name) VALUES ('delete', old.rowid, old.Name);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Search_Update AFTER UPDATE OF Name ON Task BEGIN
+                INSERT INTO TaskSearch (TaskSearch, rowid, Name) VALUES ('delete', old.rowid, old.Name);
+                INSERT INTO TaskSearch (rowid, Name) VALUES (new.rowid, new.Name);
+            END
+            """,
+            # index the tasks that existed before this migration
+            "INSERT INTO TaskSearch (TaskSearch) VALUES ('rebuild')",
+        ),
+        # 5: append-only change log for incremental sync, written by triggers so every mutation 
+        #    (single, bulk or group-committed) is logged in its own transaction
+        (
+            """
+            CREATE TABLE IF NOT EXISTS ChangeLog (
+                Seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                Entity TEXT NOT NULL,
+                Op TEXT NOT NULL,
+                EntityId TEXT,
+                Payload TEXT,
+                CreatedAt TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Project_Log_Insert AFTER INSERT ON Project BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('project', 'insert', new.Id, json_object('id', new.Id, 'name', new.Name));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Project_Log_Update AFTER UPDATE ON Project BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('project', 'update', new.Id, json_object('id', new.Id, 'name', new.Name));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Project_Log_Delete AFTER DELETE ON Project BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('project', 'delete', old.Id, json_object('id', old.Id));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Log_Insert AFTER INSERT ON Task BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('task', 'insert', new.Id, json_object('id', new.Id, 'project_id', new.ProjectId, 'name', new.Name, 'due_date', new.DueDate, 'status', new.Status));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Log_Update AFTER UPDATE ON Task BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('task', 'update', new.Id, json_object('id', new.Id, 'project_id', new.ProjectId, 'name', new.Name, 'due_date', new.DueDate, 'status', new.Status));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Task_Log_Delete AFTER DELETE ON Task BEGIN
+                INSERT INTO ChangeLog (Entity, Op, EntityId, Payload) VALUES ('task', 'delete', old.Id, json_object('id', old.Id, 'project_id', old.ProjectId));
+            END
+            """,
+        ),
+        # 6: the project changes (and purges) in the change log, read by the project cache when it syncs
+        (
+            "CREATE INDEX IF NOT EXISTS IX_ChangeLog_Entity_Seq ON ChangeLog (Entity, Seq)",
+        ),
+    ]
+
+    # the methods that only read, AsyncAsana_Api runs them on its reader pool and every other method on its writer thread
+    READ_METHODS = frozenset({
+        "get_project_id", "get_project_by_id", "get_project_by_name", "get_projects", "get_projects_page", "iter_projects",
+        "get_task_by_id", "get_task_by_name", "get_tasks_by_ids", "get_tasks_by_project_id", "get_tasks_by_project_name",
+        "get_tasks_page_by_project_id", "get_tasks_page_by_project_name", "get_tasks_page_by_project_names", "iter_tasks_by_project_id",
+        "search_tasks", "get_task_status_counts", "get_project_summaries", "changes_since",
+    })
+
+    # AsanaTaskUpdate field -> Task column, used to build partial updates
+    TASK_UPDATE_COLUMNS = {"name": "Name", "due_date": "DueDate", "status": "Status"}
+
+    # NOTE:
+    # - Listings are keyset paginated on Id: the cursor is the Id of the last item of the previous page.
+    # - Unlike OFFSET, every page costs the same no matter how deep the caller pages.
+    # - A limit below 1 is raised to 1, a page always moves the cursor forward.
+
+    def __init__(self, storage: AsanaStorage = None, project_cache_size: int = 256, group_commit: AsanaGroupCommit = None, project_cache_sync_interval: float = 1.0):
+        storage = storage or AsanaStorage()
+        self.__pool = SqlLiteConnectionPool(storage.database, storage.uri)
+        self.__project_cache = ProjectCache(project_cache_size, project_cache_sync_interval)
+        self.__schema_lock = threading.Lock()
+        self.__schema_ready = False
+        self.__group_commit = group_commit
+        self.__writer: GroupCommitWriter = None
+
+    @property
+    def project_cache(self) -> ProjectCache:
+        return self.__project_cache
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.__writer:
+            self.__writer.close()
 
+        self.__pool.close()
+
+    def __client(self) -> SqlLiteClient:
+        self.__ensure_schema()
+        return self.__pool.client()
+
+    def __ensure_schema(self):
+        # the migrations run on first use, not in __init__, so constructing an Asana_Api (e.g. on every Streamlit rerun) doesn't touch the database
+        if self.__schema_ready:
+            return
+
+        with self.__schema_lock:
+            if not self.__schema_ready:
+                self.__migrate()
+                # started after the migrations so its connection never races them for the schema lock
+                if self.__group_commit:
+                    self.__writer = GroupCommitWriter(self.__pool, self.__group_commit)
+
+                self.__schema_ready = True
+
+    def __write(self, operation: Callable[[SqlLiteClient], Any]) -> Any:
+        # every mutation goes through here: either committed on its own or handed to the group-commit writer
+        self.__ensure_schema()
+        if self.__writer:
+            return self.__writer.submit(operation)
+
+        client = self.__pool.client()
+        try:
+            result = operation(client)
             client.commit()
+            return result
+        finally:
+            client.close()
+    
+    def __migrate(self):
+        client = self.__pool.client()
+        try:
+            while True:
+                # re-read the version inside the write lock so concurrent processes don't apply a migration twice
+                client.execute("BEGIN IMMEDIATE")
+                client.execute("PRAGMA user_version")
+                version = client.fetchone()[0]
+
+                if version >= len(Asana_Api.MIGRATIONS):
+                    client.commit()
+                    break
+
+                for sql in Asana_Api.MIGRATIONS[version]:
+                    client.execute(sql)
+
+                client.execute(f"PRAGMA user_version = {version + 1}")
+                client.commit()
         finally:
             client.close()
 
     def purge_all_data(self):
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:            
+            # the change log survives a purge, consumers see a 'purge' entry and know to drop their copy
+            client.execute("BEGIN IMMEDIATE")
+            client.execute("INSERT INTO ChangeLog (Entity, Op) VALUES ('*', 'purge')")
+            client.execute("DROP TABLE IF EXISTS TaskSearch")
             client.execute("DROP TABLE IF EXISTS Task")
             client.execute("DROP TABLE IF EXISTS Project")        
+            client.execute("PRAGMA user_version = 0")
             client.commit()
         finally:
             client.close()
         
-        self.__create_tables()
+        self.__project_cache.clear()
+        self.__migrate()
 
     #----------------------#
     #      PROJECTS        #
     #----------------------#
     def create_project(self, project_name: str) -> AsanaProject:
         project_id = str(uuid.uuid4())
-        client = SqlLiteClient("asana.db")
-        try:
-            client.execute("INSERT INTO Project (Id, Name) VALUES (?, ?)", (project_id, project_name))
-            client.commit()
-            return AsanaProject(
-                project_id, 
-                project_name,
-                f"https://example.com/projects/{project_id}"
-            )            
-        finally:
-            client.close()            
+        self.__write(lambda client: client.execute("INSERT INTO Project (Id, Name) VALUES (?, ?)", (project_id, project_name)))
+        self.__project_cache.invalidate_name(project_name)
+        return AsanaProject(project_id, project_name)
 
     def get_project_id(self, project_name: str) -> str:
-        client = SqlLiteClient("asana.db")
-        try:
-            client.execute("SELECT Id FROM Project WHERE Name = ?", (project_name,))
-            result = client.fetchone()
-            return result[0] if result else None
-        finally:
-            client.close()
+        project = self.get_project_by_name(project_name)
+        return project.id if project else None
 
 
     def get_project_by_id(self, project_id: str) -> AsanaProject:
-        client = SqlLiteClient("asana.db")
+        self.__sync_project_cache()
+        if project := self.__project_cache.get_by_id(project_id):
+            return project
+
+        client = self.__client()
         try:
+            version = self.__project_cache.version
             client.execute("SELECT Id, Name FROM Project WHERE Id = ?", (project_id,))
             entity = client.fetchone()
-            return self.__map_project__(entity) if entity else None
+            if not entity:
+                return None
+
+            project = self.__map_project__(entity)
+            self.__project_cache.put(project, version)
+            return project
         finally:
             client.close()
     
     def get_project_by_name(self, project_name: str) -> AsanaProject:
-        client = SqlLiteClient("asana.db")
+        self.__sync_project_cache()
+        if project := self.__project_cache.get_by_name(project_name):
+            return project
+
+        client = self.__client()
         try:
+            version = self.__project_cache.version
             client.execute("SELECT Id, Name FROM Project WHERE Name = ?", (project_name,))
             entity = client.fetchone()
-            return self.__map_project__(entity) if entity else None
+            if not entity:
+                return None
+
+            project = self.__map_project__(entity)
+            self.__project_cache.put(project, version, by_name=True)
+            return project
         finally:
             client.close()
     
 
     def update_project(self, project_id: str, model: AsanaProjectUpdate) -> AsanaProject:
-        entity = self.get_project_by_id(project_id)
-        client = SqlLiteClient("asana.db")
-        try:
-            if not entity:
-                return None
+        if not model.name:
+            return self.get_project_by_id(project_id)
 
-            client.execute("UPDATE Project SET Name = ? WHERE Id = ? ", (model.name, project_id))
-            client.commit()
+        entity = self.__write(lambda client: client.execute("UPDATE Project SET Name = ? WHERE Id = ? RETURNING Id, Name", (model.name, project_id)).fetchone())
+        if not entity:
+            return None
 
-            entity.name = model.name
-            return entity
-        finally:
-            client.close()
+        self.__project_cache.invalidate_id(project_id)
+        self.__project_cache.invalidate_name(model.name)
+        return self.__map_project__(entity)
     
 
     def get_projects(self) -> list[AsanaProject]:
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:
             client.execute("SELECT Id, Name FROM Project")
             entities = client.fetchall()
-            return [self.__map_project__(entity) for entity in entities]
+            return self.__map_projects__(entities)
         finally:
             client.close()
     
 
-    def delete_project_by_id(self, project_id: str) -> bool:
-        client = SqlLiteClient("asana.db")
+    def get_projects_page(self, cursor: str = None, limit: int = 50) -> AsanaPage:
+        limit = max(limit, 1)
+        client = self.__client()
         try:
-            if project_id:
-                client.execute("DELETE FROM Task WHERE ProjectId = ?", (project_id,))
-                client.execute("DELETE FROM Project WHERE Id = ?", (project_id,))
-                client.commit()
-                return True
-
-            return False
+            # fetch one extra row to know whether there is a next page
+            client.execute("SELECT Id, Name FROM Project WHERE Id > ? ORDER BY Id LIMIT ?", (cursor or "", limit + 1))
+            entities = client.fetchall()
+            return self.__page__(self.__map_projects__(entities), limit)
         finally:
             client.close()
+
+    def iter_projects(self, batch_size: int = 500) -> Iterator[AsanaProject]:
+        cursor = None
+        while True:
+            page = self.get_projects_page(cursor, batch_size)
+            yield from page.items
+            if not (cursor := page.next_cursor):
+                return
+    
+
+    def delete_project_by_id(self, project_id: str) -> bool:
+        if not project_id:
+            return False
+
+        def delete(client: SqlLiteClient):
+            client.execute("DELETE FROM Task WHERE ProjectId = ?", (project_id,))
+            client.execute("DELETE FROM Project WHERE Id = ?", (project_id,))
+
+        self.__write(delete)
+        self.__project_cache.invalidate_id(project_id)
+        return True
     
 
     def delete_project(self, project_name: str) -> bool:
@@ -195,23 +812,32 @@ class Asana_Api:
         if not due_date or due_date == "today":
             due_date = str(datetime.now().date())
 
-        client = SqlLiteClient("asana.db")
-        try:
-            client.execute("INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?,?)", (task_id, project_id, task_name, due_date, status))
-            client.commit()
-            return AsanaTask(
-                id=task_id,
-                project_id=project_id,
-                name=task_name,
-                due_date=due_date,
-                status=status,
-                link=f"https://example.com/tasks/{task_id}")
-        finally:
-            client.close()
+        self.__write(lambda client: client.execute("INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?,?)", (task_id, project_id, task_name, due_date, status)))
+        return AsanaTask(
+            id=task_id,
+            project_id=project_id,
+            name=task_name,
+            due_date=due_date,
+            status=status)
+            
+
+    def create_tasks(self, project_id: str, tasks: list[AsanaTaskCreate]) -> list[AsanaTask]:
+        today = str(datetime.now().date())
+        rows = [
+            (str(uuid.uuid4()), project_id, task.name, today if not task.due_date or task.due_date == "today" else task.due_date, task.status)
+            for task in tasks
+        ]
+
+        if not rows:
+            return []
+
+        # one transaction (and one commit) for the whole batch
+        self.__write(lambda client: client.executemany("INSERT INTO Task (Id, ProjectId, Name, DueDate, Status) VALUES (?, ?, ?, ?, ?)", rows))
+        return self.__map_tasks__(rows)
             
 
     def get_task_by_id(self, task_id: str) -> AsanaTask:
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:        
             client.execute("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE Id = ?", (task_id,))
             entity = client.fetchone()
@@ -225,7 +851,7 @@ class Asana_Api:
         if not project:
             return None
         
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:        
             client.execute("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE ProjectId = ? AND Name = ?", (project.id, name))
             entity = client.fetchone()
@@ -235,11 +861,11 @@ class Asana_Api:
     
 
     def get_tasks_by_project_id(self, project_id: str) -> list[AsanaTask]:
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:                
             client.execute("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE ProjectId = ?", (project_id, ))
             entities = client.fetchall()
-            return [self.__map_task__(entity) for entity in entities]
+            return self.__map_tasks__(entities)
         finally:
             client.close()
         
@@ -252,90 +878,363 @@ class Asana_Api:
             "WHERE p.Name = ? "            
         )
         
-        client = SqlLiteClient("asana.db")
+        client = self.__client()
         try:                
             client.execute(sql, (project_name, ))
             entities = client.fetchall()
-            return [self.__map_task__(entity) for entity in entities]
+            return self.__map_tasks__(entities)
+        finally:
+            client.close()
+
+
+    def get_tasks_page_by_project_id(self, project_id: str, cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
+        return self.__tasks_page__("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE ProjectId = ?", [project_id], cursor, limit, status, due_from, due_to)
+
+    def get_tasks_page_by_project_name(self, project_name: str, cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
+        project = self.get_project_by_name(project_name)
+        if not project:
+            return AsanaPage([])
+
+        return self.get_tasks_page_by_project_id(project.id, cursor, limit, status, due_from, due_to)
+
+    def get_tasks_page_by_project_names(self, project_names: list[str], cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
+        # one query for any number of projects: the names are bound as a single json array, so there is no bound parameter limit to chunk around
+        # NOTE: project names are not unique, each name resolves to the one project get_project_by_name returns, so the page matches get_tasks_page_by_project_name.
+        if not project_names:
+            return AsanaPage([])
+
+        sql = (
+            "SELECT t.Id, t.ProjectId, t.Name, t.DueDate, t.Status "
+            "FROM Task AS t "
+            "WHERE t.ProjectId IN (SELECT (SELECT Id FROM Project WHERE Name = n.value LIMIT 1) FROM json_each(?) AS n)"
+        )
+        return self.__tasks_page__(sql, [json.dumps(project_names)], cursor, limit, status, due_from, due_to, "t.")
+
+    def iter_tasks_by_project_id(self, project_id: str, status: str = None, due_from: str = None, due_to: str = None, batch_size: int = 500) -> Iterator[AsanaTask]:
+        cursor = None
+        while True:
+            page = self.get_tasks_page_by_project_id(project_id, cursor, batch_size, status, due_from, due_to)
+            yield from page.items
+            if not (cursor := page.next_cursor):
+                return
+
+
+    def get_tasks_by_ids(self, task_ids: list[str]) -> list[AsanaTask]:
+        # one query for any number of ids (bound as a single json array); tasks are returned in the order of the given ids, missing ids are skipped
+        if not task_ids:
+            return []
+
+        client = self.__client()
+        try:
+            client.execute("SELECT Id, ProjectId, Name, DueDate, Status FROM Task WHERE Id IN (SELECT value FROM json_each(?))", (json.dumps(task_ids),))
+            entities = client.fetchall()
         finally:
             client.close()
 
+        # ids are NOCASE, so match them folded the same way
+        tasks = {task.id.translate(ProjectCache.NOCASE): task for task in self.__map_tasks__(entities)}
+        return [task for task_id in dict.fromkeys(task_id.translate(ProjectCache.NOCASE) for task_id in task_ids if task_id) if (task := tasks.get(task_id))]
+
+    def search_tasks(self, query: str, project_name: str = None, limit: int = 10) -> list[AsanaTask]:
+        # every word is quoted so user text can't inject FTS5 syntax; words are OR'ed and bm25 ranks the matches
+        match = " OR ".join(f'"{word}"' for word in re.findall(r"\w+", query or ""))
+        if not match:
+            return []
+
+        sql = (
+            "SELECT t.Id, t.ProjectId, t.Name, t.DueDate, t.Status "
+            "FROM TaskSearch AS s "
+            "JOIN Task AS t ON t.rowid = s.rowid "
+            "WHERE TaskSearch MATCH ? "
+        )
+        parameters = [match]
+
+        if project_name:
+            project = self.get_project_by_name(project_name)
+            if not project:
+                return []
+
+            sql += "AND t.ProjectId = ? "
+            parameters.append(project.id)
+
+        sql += "ORDER BY s.rank LIMIT ?"
+        parameters.append(limit)
+
+        client = self.__client()
+        try:
+            client.execute(sql, parameters)
+            entities = client.fetchall()
+            return self.__map_tasks__(entities)
+        finally:
+            client.close()
 
     def update_task_status(self, task_id: str, status: str) -> bool:
         if task_id and status:
-            client = SqlLiteClient("asana.db")
-            try:                            
-                client.execute("UPDATE Task SET Status = ? WHERE Id = ?", (status, task_id,))
-                client.commit()
-                return True
-            finally:
-                client.close()
+            return self.__write(lambda client: client.execute("UPDATE Task SET Status = ? WHERE Id = ?", (status, task_id,)).rowcount > 0)
 
         return False
 
+    def update_task_statuses(self, updates: list[AsanaTaskStatusUpdate]) -> int:
+        parameters = [(update.status, update.task_id) for update in updates if update.task_id and update.status]
+        if not parameters:
+            return 0
+
+        return self.__write(lambda client: client.executemany("UPDATE Task SET Status = ? WHERE Id = ?", parameters).rowcount)
+
     def update_task(self, task_id: str, model: AsanaTaskUpdate) -> AsanaTask:
-        entity = self.get_task_by_id(task_id)
-        if not entity:
-            return None
+        changes = {column: value for field, column in Asana_Api.TASK_UPDATE_COLUMNS.items() if (value := getattr(model, field)) is not None}
+        if not changes:
+            return self.get_task_by_id(task_id)
 
         sql = (
             "UPDATE Task "
-            "SET Name = ?, DueDate = ?, Status = ? "
-            "WHERE Id = ?"
+            f"SET {', '.join(f'{column} = ?' for column in changes)} "
+            "WHERE Id = ? "
+            "RETURNING Id, ProjectId, Name, DueDate, Status"
         )
 
-        client = SqlLiteClient("asana.db")
-        try:                            
-            client.execute(sql, (model.name, model.due_date, model.status, task_id))
-            client.commit()
-        finally:
-            client.close()        
-
-        entity.name = model.name
-        entity.due_date = model.due_date
-        entity.status = model.due_date
-
-        return entity
+        entity = self.__write(lambda client: client.execute(sql, (*changes.values(), task_id)).fetchone())
+        return None if not entity else self.__map_task__(entity)
 
     def delete_task_by_id(self, task_id: str) -> bool:
         if task_id:
-            client = SqlLiteClient("asana.db")
-            try:                                        
-                client.execute("DELETE FROM Task WHERE Id = ?", (task_id,))
-                client.commit()
-                return True
-            finally:
-                client.close()        
+            self.__write(lambda client: client.execute("DELETE FROM Task WHERE Id = ?", (task_id,)))
+            return True
 
         return False
 
+    def delete_tasks(self, task_ids: list[str]) -> int:
+        parameters = [(task_id,) for task_id in task_ids if task_id]
+        if not parameters:
+            return 0
+
+        return self.__write(lambda client: client.executemany("DELETE FROM Task WHERE Id = ?", parameters).rowcount)
+
     def delete_task_by_name(self, project_name: str, name: str) -> bool:
         project = self.get_project_by_name(project_name)
         if not project:
             return False
 
         if name:
-            client = SqlLiteClient("asana.db")
-            try:                                                    
-                client.execute("DELETE FROM Task WHERE ProjectId = ? AND Name = ?", (project.id, name))
-                client.commit()
-                return True
-            finally:
-                client.close()        
+            self.__write(lambda client: client.execute("DELETE FROM Task WHERE ProjectId = ? AND Name = ?", (project.id, name)))
+            return True
 
         return False
 
-    def __map_task__(self, entity: sqlite3.Row) -> AsanaTask:
-        return AsanaTask(
-            id=entity["Id"],
-            project_id=entity["ProjectId"],
-            name=entity["Name"],
-            due_date=entity["DueDate"],
-            status=entity["Status"],
-            link=f"https://example.com/tasks/{entity["Id"]}")
-
-    def __map_project__(self, entity: sqlite3.Row) -> AsanaProject:
-        return AsanaProject(
-            id=entity["Id"],
-            name=entity["Name"],
-            link=f"https://example.com/projects/{entity["Id"]}")
+    #----------------------#
+    #      AGGREGATES      #
+    #----------------------#
+    def get_task_status_counts(self, project_name: str = None) -> list[AsanaStatusCount]:
+        sql = (
+            "SELECT p.Id, p.Name, t.Status, COUNT(*) "
+            "FROM Task AS t "
+            "JOIN Project AS p ON t.ProjectId = p.Id "
+        )
+        parameters = []
+
+        if project_name:
+            sql += "WHERE p.Name = ? "
+            parameters.append(project_name)
+
+        sql += "GROUP BY p.Id, t.Status ORDER BY p.Name, t.Status"
+
+        client = self.__client()
+        try:
+            client.execute(sql, parameters)
+            entities = client.fetchall()
+            return list(starmap(AsanaStatusCount, entities))
+        finally:
+            client.close()
+
+    def get_project_summaries(self, project_name: str = None, as_of: str = None) -> list[AsanaProjectSummary]:
+        # a task is open until its status is 'Completed'; open tasks due before `as_of` are overdue
+        as_of = as_of or str(datetime.now().date())
+        sql = (
+            "SELECT p.Id, p.Name, COUNT(t.Id), "
+            "COALESCE(SUM(t.Status = 'Completed' COLLATE NOCASE), 0), "
+            "COALESCE(SUM(t.Status IS NOT 'Completed' COLLATE NOCASE AND t.DueDate < ?), 0), "
+            "MIN(CASE WHEN t.Status IS NOT 'Completed' COLLATE NOCASE AND t.DueDate >= ? THEN t.DueDate END) "
+            "FROM Project AS p "
+            "LEFT JOIN Task AS t ON t.ProjectId = p.Id "
+        )
+        parameters = [as_of, as_of]
+
+        if project_name:
+            sql += "WHERE p.Name = ? "
+            parameters.append(project_name)
+
+        sql += "GROUP BY p.Id ORDER BY p.Name"
+
+        client = self.__client()
+        try:
+            client.execute(sql, parameters)
+            entities = client.fetchall()
+            return [
+                AsanaProjectSummary(project_id, name, total, completed, overdue, next_due_date, round(completed / total, 2) if total else 0.0)
+                for project_id, name, total, completed, overdue, next_due_date in entities
+            ]
+        finally:
+            client.close()
+
+    #----------------------#
+    #     CHANGE FEED      #
+    #----------------------#
+    # NOTES:
+    # - The change log only grows with the writes, `prune_changes` trims it: the entries before `before_seq` are deleted and the last
+    #   of them is replaced by a ('*', 'prune') entry that keeps its seq.
+    # - A consumer whose `since` is older than the trimmed range gets that 'prune' entry first and must resync (reload its copy and
+    #   carry on from the entry's seq), the same way it handles a 'purge' entry; a consumer already past it never sees it.
+    def prune_changes(self, before_seq: int) -> int:
+        def prune(client: SqlLiteClient) -> int:
+            # never past the last entry, so the consumers that are up to date don't get a 'prune' entry for nothing
+            client.execute("SELECT COALESCE(MAX(Seq), 0) FROM ChangeLog")
+            marker_seq = min(before_seq, client.fetchone()[0] + 1) - 1
+            if marker_seq < 1:
+                return 0
+
+            deleted = client.execute("DELETE FROM ChangeLog WHERE Seq <= ?", (marker_seq,)).rowcount
+            client.execute("INSERT INTO ChangeLog (Seq, Entity, Op) VALUES (?, '*', 'prune')", (marker_seq,))
+            return deleted
+
+        return self.__write(prune)
+
+    def changes_since(self, seq: int = 0, limit: int = 1000) -> list[AsanaChange]:
+        client = self.__client()
+        try:
+            client.execute("SELECT Seq, Entity, Op, EntityId, Payload, CreatedAt FROM ChangeLog WHERE Seq > ? ORDER BY Seq LIMIT ?", (seq, limit))
+            entities = client.fetchall()
+            return [
+                AsanaChange(seq, entity, op, entity_id, json.loads(payload) if payload else None, created_at)
+                for seq, entity, op, entity_id, payload, created_at in entities
+            ]
+        finally:
+            client.close()
+
+    async def subscribe_changes(self, since: int = 0, poll_interval: float = 0.5, batch_size: int = 1000) -> AsyncIterator[AsanaChange]:
+        # polls the change log off the event loop and yields every change after `since`, in order, forever
+        seq = since
+        while True:
+            changes = await asyncio.to_thread(self.changes_since, seq, batch_size)
+            for change in changes:
+                seq = change.seq
+                yield change
+
+            if len(changes) < batch_size:
+                await asyncio.sleep(poll_interval)
+
+    def __sync_project_cache(self):
+        # every committed project write (and purge or prune) is in the change log, from any connection or process; read at most 
+        # every sync_interval, and only the project and '*' entries after the cache's position (task writes don't count)
+        cache = self.__project_cache
+        if not cache.sync_due():
+            return
+
+        client = self.__client()
+        try:
+            if cache.change_seq is None:
+                client.execute("SELECT COALESCE(MAX(Seq), 0) FROM ChangeLog")
+                cache.sync(client.fetchone()[0])
+                return
+
+            client.execute(
+                "SELECT Seq, Entity, EntityId, json_extract(Payload, '$.name') FROM ChangeLog WHERE Entity IN ('project', '*') AND Seq > ? ORDER BY Seq LIMIT ?", 
+                (cache.change_seq, cache.max_size + 1)
+            )
+            entities = client.fetchall()
+        finally:
+            client.close()
+
+        if not entities:
+            cache.sync(cache.change_seq)
+        elif len(entities) > cache.max_size or any(entity == "*" for _, entity, _, _ in entities):
+            cache.sync(entities[-1][0], None)
+        else:
+            cache.sync(entities[-1][0], [(project_id, name) for _, _, project_id, name in entities])
+
+    def __tasks_page__(self, sql: str, parameters: list[Any], cursor: str, limit: int, status: str, due_from: str, due_to: str, alias: str = "") -> AsanaPage:
+        # keyset pagination over the tasks selected by `sql`, ordered by task id, with the optional status and due date filters
+        limit = max(limit, 1)
+        parameters = [*parameters, cursor or ""]
+        sql += f" AND {alias}Id > ?"
+
+        if status:
+            sql += f" AND {alias}Status = ?"
+            parameters.append(status)
+
+        if due_from:
+            sql += f" AND {alias}DueDate >= ?"
+            parameters.append(due_from)
+
+        if due_to:
+            sql += f" AND {alias}DueDate <= ?"
+            parameters.append(due_to)
+
+        # fetch one extra row to know whether there is a next page
+        sql += f" ORDER BY {alias}Id LIMIT ?"
+        parameters.append(limit + 1)
+
+        client = self.__client()
+        try:
+            client.execute(sql, parameters)
+            entities = client.fetchall()
+            return self.__page__(self.__map_tasks__(entities), limit)
+        finally:
+            client.close()
+
+    def __page__(self, items: list[Any], limit: int) -> AsanaPage:
+        if len(items) > limit:
+            del items[limit:]
+            return AsanaPage(items, items[-1].id)
+
+        return AsanaPage(items)
+
+    def __map_task__(self, entity: tuple) -> AsanaTask:
+        return AsanaTask(*entity)
+
+    def __map_tasks__(self, entities: list[tuple]) -> list[AsanaTask]:
+        return list(starmap(AsanaTask, entities))
+
+    def __map_project__(self, entity: tuple) -> AsanaProject:
+        return AsanaProject(*entity)
+
+    def __map_projects__(self, entities: list[tuple]) -> list[AsanaProject]:
+        return list(starmap(AsanaProject, entities))
+
+
+class AsyncAsana_Api:
+    # NOTE:
+    # - An awaitable facade over Asana_Api: every public method is exposed as a coroutine that runs off the event loop,
+    #   so the sqlite3 calls never block it (e.g. while the agent is streaming tokens).
+    # - The reads (Asana_Api.READ_METHODS) run on a bounded thread pool, each worker thread gets its own connection from the Asana_Api connection pool.
+    # - Every other method is a write and runs on a single writer thread (`run_write`): concurrent writers would only queue on SQLite's write lock 
+    #   (busy_timeout retries with back-off), so writes are serialized in arrival order and never hold up the readers.
+    def __init__(self, api: Asana_Api = None, max_workers: int = 4):
+        self.__api = api or Asana_Api()
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asana")
+        self.__write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asana-write")
+
+    async def run(self, function: Callable, /, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def run_write(self, function: Callable, /, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__write_executor, functools.partial(function, *args, **kwargs))
+
+    def close(self):
+        self.__write_executor.shutdown(wait=True)
+        self.__executor.shutdown(wait=True)
+        self.__api.close()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.__api, name)
+        if name.startswith("_") or not callable(attribute) or inspect.iscoroutinefunction(attribute) or inspect.isasyncgenfunction(attribute):
+            return attribute
+
+        run = self.run if name in Asana_Api.READ_METHODS else self.run_write
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await run(attribute, *args, **kwargs)
+
+        return method
@@ -0,0 +1,63 @@
+# NOTE:
+# - Token-compact encodings of the Asana tool results. Tool returns stay in the message history and are resent with every
+#   later model call, so repeating every key name and link in each row adds up quickly.
+# - Columnar: lists (and pages) become {"columns": [...], "rows": [[...], ...]} so key names are sent once per result.
+# - Links are left out unless asked for, the model can always ask for an object by id.
+# - Fields: an optional projection, only these fields are returned.
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Any
+from asana_api import AsanaPage
+
+@dataclass(frozen=True)
+class AsanaResultFormat:
+    columnar: bool = True
+    include_links: bool = False
+    fields: tuple[str, ...] = None
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, AsanaPage):
+            encoded = self.__encode_list(value.items)
+            if not self.columnar:
+                encoded = {"items": encoded}
+
+            encoded["next_cursor"] = value.next_cursor
+            return encoded
+
+        if isinstance(value, list) and value and all(dataclasses.is_dataclass(item) for item in value):
+            return self.__encode_list(value)
+
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            columns = self.__columns(type(value))
+            return dict(zip(columns, self.__values(value, columns)))
+
+        return value
+
+    def __encode_list(self, items: list[Any]) -> Any:
+        if not items:
+            return {"columns": [], "rows": []} if self.columnar else []
+
+        columns = self.__columns(type(items[0]))
+        if self.columnar:
+            return {"columns": columns, "rows": [self.__values(item, columns) for item in items]}
+
+        return [dict(zip(columns, self.__values(item, columns))) for item in items]
+
+    def __columns(self, item_type: type) -> list[str]:
+        columns = [field.name for field in dataclasses.fields(item_type)]
+        if self.include_links and isinstance(getattr(item_type, "link", None), property):
+            columns.append("link")
+
+        if self.fields:
+            columns = [column for column in columns if column in self.fields]
+
+        return columns
+
+    @staticmethod
+    def __values(item: Any, columns: list[str]) -> list[Any]:
+        return [getattr(item, column) for column in columns]
+
+
+# the original output: one object per row with its link
+AsanaResultFormat.VERBOSE = AsanaResultFormat(columnar=False, include_links=True)
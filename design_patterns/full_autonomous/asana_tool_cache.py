@@ -0,0 +1,75 @@
+# NOTE:
+# - Memoizes the read tool results for one agent run (or a session), so a model calling the same read tool with the same
+#   arguments again (e.g. get_projects() before and after a create) skips SQLite and the result encoding.
+# - Any write tool clears it; `version` changes on every clear so a read that raced with a write doesn't put a stale result back.
+# - Only writes made through the same AsanaTools are seen, keep the scope short (a run) when other processes write to the database.
+# - Results are the encoded tool results handed to the model, they are shared between calls and treated as read-only.
+# - `served` records the calls served from the cache, in order, for reporting.
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+@dataclass(frozen=True, slots=True)
+class AsanaToolCall:
+    name: str
+    arguments: tuple[tuple[str, Any], ...]
+
+class AsanaToolCache:
+    MISSING = object()
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__results: dict[AsanaToolCall, Any] = {}
+        self.served: list[AsanaToolCall] = []
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def call(name: str, arguments: dict[str, Any]) -> AsanaToolCall:
+        # None if an argument can't be used as a key, that call is simply not memoized
+        call = AsanaToolCall(name, tuple((key, AsanaToolCache.__freeze(value)) for key, value in arguments.items()))
+        try:
+            hash(call)
+        except TypeError:
+            return None
+
+        return call
+
+    def get(self, call: AsanaToolCall) -> Any:
+        with self.__lock:
+            result = self.__results.get(call, AsanaToolCache.MISSING)
+            if result is AsanaToolCache.MISSING:
+                self.misses += 1
+                return result
+
+            self.hits += 1
+            self.served.append(call)
+            return result
+
+    def put(self, call: AsanaToolCall, result: Any, version: int):
+        with self.__lock:
+            if version == self.version:
+                self.__results[call] = result
+
+    def invalidate(self):
+        with self.__lock:
+            self.version += 1
+            self.invalidations += 1
+            self.__results.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return {"size": len(self.__results), "hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+    @staticmethod
+    def __freeze(value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            return tuple(AsanaToolCache.__freeze(item) for item in value)
+
+        if isinstance(value, dict):
+            return tuple(sorted((key, AsanaToolCache.__freeze(item)) for key, item in value.items()))
+
+        return value
@@ -4,36 +4,75 @@
 # - For this example, I opted for the `tool definition` flavor because it is loosely coupled to the agent until runtime.
 #   This approach ensures flexibility, allowing the tools to be reused by various Asana agents (e.g., Console, Streamlit, etc.).
 
+import contextlib
+import contextvars
+import copy
+import functools
+import inspect
 import json
-from typing import List
+from typing import Callable, Iterator, List
 from pydantic_ai.tools import Tool
-from asana_api import Asana_Api, AsanaProject, AsanaTask, AsanaTaskUpdate
+from asana_result_format import AsanaResultFormat
+from asana_tool_cache import AsanaToolCache
+from asana_api import Asana_Api, AsyncAsana_Api, AsanaPage, AsanaProject, AsanaProjectSummary, AsanaProjectUpdate, AsanaStatusCount, AsanaStorage, AsanaTask, AsanaTaskCreate, AsanaTaskStatusUpdate, AsanaTaskUpdate
 
 class AsanaTools:
-    def __init__(self):
-        self.__asana__ = Asana_Api()
+    # listings are returned a page at a time so large projects don't flood the model's context
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    # idempotent tools that can be memoized within a run, every other tool is a write and clears the memoized results
+    READ_TOOLS = frozenset({
+        "get_project_id", "get_project_by_id", "get_project_by_name", "get_projects",
+        "get_task_by_id", "get_task_by_name", "get_tasks_by_ids", "get_tasks_by_project_id", "get_tasks_by_project_name", "get_tasks_for_projects", "search_tasks",
+        "get_task_status_counts", "get_project_summaries",
+    })
+
+    # tool templates (parameter validator and JSON schema) built once per process, keyed by tools class and tool name
+    __schemas__: dict[tuple[type, str], Tool] = {}
+
+    # the memoized results of the current run, per tools instance (see memoize)
+    __run_caches__: contextvars.ContextVar[dict["AsanaTools", AsanaToolCache]] = contextvars.ContextVar("asana_run_caches", default={})
+
+    # NOTE:
+    # - Tool results are encoded with an AsanaResultFormat (columnar, no links by default) to keep the message history small.
+    # - `formats` overrides the encoding per tool name, e.g. {"get_task_by_id": AsanaResultFormat.VERBOSE}.
+    def __init__(self, storage: AsanaStorage = None, default_format: AsanaResultFormat = AsanaResultFormat(), formats: dict[str, AsanaResultFormat] = None):
+        self.__asana__ = Asana_Api(storage)
+        self.__default_format__ = default_format
+        self.__formats__ = formats or {}
         self.__tools__ : List[Tool] = []
 
          # project related tools
-        self.__tools__.append(Tool(name = "create_project", function = self.create_project, description="Creates a project by name"))
-        self.__tools__.append(Tool(name = "get_project_id", function = self.get_project_id, description="Gets a project id by project name"))
-        self.__tools__.append(Tool(name = "get_project_by_id", function = self.get_project_by_id, description="Gets a project object by project id"))
-        self.__tools__.append(Tool(name = "get_project_by_name", function = self.get_project_by_name, description="Gets a project object by project name"))
-        self.__tools__.append(Tool(name = "get_projects", function = self.get_projects, description="Gets all existing project objects. Takes no arguments."))
-        self.__tools__.append(Tool(name = "update_project", function = self.update_project, description="Updates an existing project object for a given project id"))
-        self.__tools__.append(Tool(name = "delete_project_by_id", function = self.delete_project_by_id, description="Deletes an existing project object by project id"))
-        self.__tools__.append(Tool(name = "delete_project", function = self.delete_project, description="Deletes an existing project object by project name"))
+        self.__tools__.append(self.__create_tool__(name = "create_project", function = self.create_project, description="Creates a project by name"))
+        self.__tools__.append(self.__create_tool__(name = "get_project_id", function = self.get_project_id, description="Gets a project id by project name"))
+        self.__tools__.append(self.__create_tool__(name = "get_project_by_id", function = self.get_project_by_id, description="Gets a project object by project id"))
+        self.__tools__.append(self.__create_tool__(name = "get_project_by_name", function = self.get_project_by_name, description="Gets a project object by project name"))
+        self.__tools__.append(self.__create_tool__(name = "get_projects", function = self.get_projects, description="Gets a page of existing project objects. Use the next_cursor to get the next page."))
+        self.__tools__.append(self.__create_tool__(name = "update_project", function = self.update_project, description="Updates an existing project object for a given project id"))
+        self.__tools__.append(self.__create_tool__(name = "delete_project_by_id", function = self.delete_project_by_id, description="Deletes an existing project object by project id"))
+        self.__tools__.append(self.__create_tool__(name = "delete_project", function = self.delete_project, description="Deletes an existing project object by project name"))
 
         # task related tools
-        self.__tools__.append(Tool(name = "create_task", function = self.create_task, description="Creates a task by name for a given project id"))
-        self.__tools__.append(Tool(name = "get_task_by_id", function = self.get_task_by_id, description="Gets a task by task id"))
-        self.__tools__.append(Tool(name = "get_task_by_name", function = self.get_task_by_name, description="Gets a task for a given project using the project name and task name"))
-        self.__tools__.append(Tool(name = "get_tasks_by_project_id", function = self.get_tasks_by_project_id, description="Gets all existing task objects for a given project id"))
-        self.__tools__.append(Tool(name = "get_tasks_by_project_name", function = self.get_tasks_by_project_name, description="Gets all existing task objects for a given project name"))
-        self.__tools__.append(Tool(name = "update_task_status", function = self.update_task_status, description="Updates an existing task object's status for a given task id"))
-        self.__tools__.append(Tool(name = "update_task", function = self.update_task, description="Updates an existing task object for a given task id"))
-        self.__tools__.append(Tool(name = "delete_task_by_id", function = self.delete_task_by_id, description="Deletes an existing task object by task id"))
-        self.__tools__.append(Tool(name = "delete_task_by_name", function = self.delete_task_by_name, description="Deletes an existing task object for a given project name and for a given task name"))   
+        self.__tools__.append(self.__create_tool__(name = "create_task", function = self.create_task, description="Creates a task by name for a given project id"))
+        self.__tools__.append(self.__create_tool__(name = "create_tasks", function = self.create_tasks, description="Creates many tasks at once for a given project id"))
+        self.__tools__.append(self.__create_tool__(name = "get_task_by_id", function = self.get_task_by_id, description="Gets a task by task id"))
+        self.__tools__.append(self.__create_tool__(name = "get_tasks_by_ids", function = self.get_tasks_by_ids, description="Gets many tasks at once by task ids"))
+        self.__tools__.append(self.__create_tool__(name = "get_task_by_name", function = self.get_task_by_name, description="Gets a task for a given project using the project name and task name"))
+        self.__tools__.append(self.__create_tool__(name = "get_tasks_by_project_id", function = self.get_tasks_by_project_id, description="Gets a page of existing task objects for a given project id, optionally filtered by status and due date. Use the next_cursor to get the next page."))
+        self.__tools__.append(self.__create_tool__(name = "get_tasks_by_project_name", function = self.get_tasks_by_project_name, description="Gets a page of existing task objects for a given project name, optionally filtered by status and due date. Use the next_cursor to get the next page."))
+        self.__tools__.append(self.__create_tool__(name = "get_tasks_for_projects", function = self.get_tasks_for_projects, description="Gets a page of existing task objects for many project names at once, optionally filtered by status and due date. Use the next_cursor to get the next page."))
+        self.__tools__.append(self.__create_tool__(name = "search_tasks", function = self.search_tasks, description="Searches tasks by the words in their names, optionally within a given project name, best matches first"))
+        self.__tools__.append(self.__create_tool__(name = "update_task_status", function = self.update_task_status, description="Updates an existing task object's status for a given task id"))
+        self.__tools__.append(self.__create_tool__(name = "update_task_statuses", function = self.update_task_statuses, description="Updates the status of many existing task objects at once"))
+        self.__tools__.append(self.__create_tool__(name = "update_task", function = self.update_task, description="Updates an existing task object for a given task id"))
+        self.__tools__.append(self.__create_tool__(name = "delete_task_by_id", function = self.delete_task_by_id, description="Deletes an existing task object by task id"))
+        self.__tools__.append(self.__create_tool__(name = "delete_tasks", function = self.delete_tasks, description="Deletes many existing task objects at once by task ids"))
+        self.__tools__.append(self.__create_tool__(name = "delete_task_by_name", function = self.delete_task_by_name, description="Deletes an existing task object for a given project name and for a given task name"))   
+
+        # summary tools
+        self.__tools__.append(self.__create_tool__(name = "get_task_status_counts", function = self.get_task_status_counts, description="Counts the tasks by status for every project or for a given project name"))
+        self.__tools__.append(self.__create_tool__(name = "get_project_summaries", function = self.get_project_summaries, description="Summarizes every project or a given project name: task totals, completed, overdue, next due date and done ratio"))
 
     #----------------------#
     #      PROJECTS        #
@@ -98,20 +137,25 @@ class AsanaTools:
         project = self.__asana__.get_project_by_name(project_name)
         return project
 
-    def get_projects(self) -> List[AsanaProject]:
+    def get_projects(self, cursor: str = None, limit: int = 50) -> AsanaPage:
         """
-        Gets all existing project objects.
+        Gets a page of existing project objects.
 
         Example call: get_projects()            
+        Example call for the next page: get_projects("next_cursor of the previous page")
         
+        Args:
+            cursor (str): The next_cursor returned by the previous page. Leave empty for the first page.
+            limit (int): The maximum number of projects to return (at most 200). Default is 50.
         Returns:
-            List[AsanaProject]: A list of project objects if any, or an error message if the API call threw an error. 
+            AsanaPage: A page with the project objects and a next_cursor to get the next page, or None if there are no more projects, 
+            or an error message if the API call threw an error. 
         """
 
-        projects = self.__asana__.get_projects()        
+        projects = self.__asana__.get_projects_page(cursor, AsanaTools.__page_size__(limit))        
         return projects
 
-    def update_project(self, project_id: str, model: AsanaProject) -> AsanaProject:
+    def update_project(self, project_id: str, model: AsanaProjectUpdate) -> AsanaProject:
         """
         Updates an existing project object for a given project id.
 
@@ -119,7 +163,7 @@ class AsanaTools:
         
         Args:
             project_id (str): The project id to update the project object.
-            model (AsanaProject): A json representation of a model with the following properties:
+            model (AsanaProjectUpdate): A json representation of a model with the following properties:
                 {
                     "name": "(str) The name of the project to update"
                 }
@@ -181,6 +225,23 @@ class AsanaTools:
         task = self.__asana__.create_task(project_id, task_name, due_date, status)        
         return task
 
+    def create_tasks(self, project_id: str, tasks: List[AsanaTaskCreate]) -> List[AsanaTask]:
+        """
+        Creates many tasks at once for a given project id. Prefer this over calling create_task repeatedly.
+
+        Example call: create_tasks("Project Id", [{"name": "Task 1"}, {"name": "Task 2", "due_date": "2021-12-31", "status": "In Progress"}])
+        
+        Args:
+            project_id (str): The project id to create the tasks under.
+            tasks (List[AsanaTaskCreate]): The tasks to create. Each task has a name, an optional due_date in the format YYYY-MM-DD (the current day if not given) 
+                and an optional status. Possible status values: ['Not Started', 'In Progress', 'Completed']. Default is 'Not Started'.
+        Returns:
+            List[AsanaTask]: created task objects if successful, or an error message if the API call threw an error.
+        """
+
+        tasks = self.__asana__.create_tasks(project_id, tasks)
+        return tasks
+
     def get_task_by_id(self, task_id: str) -> AsanaTask:
         """
         Gets a task by task id.
@@ -196,6 +257,21 @@ class AsanaTools:
         task = self.__asana__.get_task_by_id(task_id)
         return task
 
+    def get_tasks_by_ids(self, task_ids: List[str]) -> List[AsanaTask]:
+        """
+        Gets many tasks at once by task ids. Prefer this over calling get_task_by_id repeatedly.
+
+        Example call: get_tasks_by_ids(["Task Id 1", "Task Id 2"])
+        
+        Args:
+            task_ids (List[str]): The task ids to get the task objects.
+        Returns:
+            list(AsanaTask): The task objects that exist, in the order of the given task ids, or an error message if the API call threw an error.
+        """
+
+        tasks = self.__asana__.get_tasks_by_ids(task_ids)
+        return tasks
+
     def get_task_by_name(self, project_name: str, name: str) -> AsanaTask:
         """
         Gets a task for a given project using the project name and task name.
@@ -212,34 +288,91 @@ class AsanaTools:
         task = self.__asana__.get_task_by_name(project_name, name)
         return task
 
-    def get_tasks_by_project_id(self, project_id: str) -> List[AsanaTask]:
+    def get_tasks_by_project_id(self, project_id: str, cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
         """
-        Gets all existing task objects for a given project id.
+        Gets a page of existing task objects for a given project id.
 
         Example call: get_tasks_by_project_id("Project Id")
+        Example call for the next page: get_tasks_by_project_id("Project Id", "next_cursor of the previous page")
+        Example call with filters: get_tasks_by_project_id("Project Id", status="In Progress", due_to="2021-12-31")
         
         Args:
             project_id (str): The project id where to get task objects.
+            cursor (str): The next_cursor returned by the previous page. Leave empty for the first page.
+            limit (int): The maximum number of tasks to return (at most 200). Default is 50.
+            status (str): Only return tasks with this status. Possible values: ['Not Started', 'In Progress', 'Completed'].
+            due_from (str): Only return tasks due on or after this date, in the format YYYY-MM-DD.
+            due_to (str): Only return tasks due on or before this date, in the format YYYY-MM-DD.
         Returns:
-            list(AsanaTask): A list of tasks objects if any, or an error message if the API call threw an error. 
+            AsanaPage: A page with the task objects and a next_cursor to get the next page, or None if there are no more tasks, 
+            or an error message if the API call threw an error. 
         """
 
-        tasks = self.__asana__.get_tasks_by_project_id(project_id)        
+        tasks = self.__asana__.get_tasks_page_by_project_id(project_id, cursor, AsanaTools.__page_size__(limit), status, due_from, due_to)        
         return tasks
 
-    def get_tasks_by_project_name(self, project_name: str) -> List[AsanaTask]:
+    def get_tasks_by_project_name(self, project_name: str, cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
         """
-        Gets all existing task objects for a given project name.
+        Gets a page of existing task objects for a given project name.
 
         Example call: get_tasks_by_project_name("Project Name")
+        Example call for the next page: get_tasks_by_project_name("Project Name", "next_cursor of the previous page")
+        Example call with filters: get_tasks_by_project_name("Project Name", status="Not Started", due_from="2021-12-01")
         
         Args:
             project_name (str): The project name where to get task objects.
+            cursor (str): The next_cursor returned by the previous page. Leave empty for the first page.
+            limit (int): The maximum number of tasks to return (at most 200). Default is 50.
+            status (str): Only return tasks with this status. Possible values: ['Not Started', 'In Progress', 'Completed'].
+            due_from (str): Only return tasks due on or after this date, in the format YYYY-MM-DD.
+            due_to (str): Only return tasks due on or before this date, in the format YYYY-MM-DD.
         Returns:
-            list(AsanaTask): A list of tasks objects if any, or an error message if the API call threw an error. 
+            AsanaPage: A page with the task objects and a next_cursor to get the next page, or None if there are no more tasks, 
+            or an error message if the API call threw an error. 
         """
 
-        tasks = self.__asana__.get_tasks_by_project_name(project_name)        
+        tasks = self.__asana__.get_tasks_page_by_project_name(project_name, cursor, AsanaTools.__page_size__(limit), status, due_from, due_to)        
+        return tasks
+
+    def get_tasks_for_projects(self, project_names: List[str], cursor: str = None, limit: int = 50, status: str = None, due_from: str = None, due_to: str = None) -> AsanaPage:
+        """
+        Gets a page of existing task objects for many project names at once. Prefer this over calling get_tasks_by_project_name for each project.
+
+        Example call: get_tasks_for_projects(["Project Name 1", "Project Name 2"])
+        Example call for the next page: get_tasks_for_projects(["Project Name 1", "Project Name 2"], "next_cursor of the previous page")
+        Example call with filters: get_tasks_for_projects(["Project Name 1", "Project Name 2"], status="In Progress", due_to="2021-12-31")
+        
+        Args:
+            project_names (List[str]): The project names where to get task objects.
+            cursor (str): The next_cursor returned by the previous page. Leave empty for the first page.
+            limit (int): The maximum number of tasks to return (at most 200). Default is 50.
+            status (str): Only return tasks with this status. Possible values: ['Not Started', 'In Progress', 'Completed'].
+            due_from (str): Only return tasks due on or after this date, in the format YYYY-MM-DD.
+            due_to (str): Only return tasks due on or before this date, in the format YYYY-MM-DD.
+        Returns:
+            AsanaPage: A page with the task objects of all the given projects (each with its project_id) and a next_cursor to get the next page, 
+            or None if there are no more tasks, or an error message if the API call threw an error. 
+        """
+
+        tasks = self.__asana__.get_tasks_page_by_project_names(project_names, cursor, AsanaTools.__page_size__(limit), status, due_from, due_to)
+        return tasks
+
+    def search_tasks(self, query: str, project_name: str = None, limit: int = 10) -> List[AsanaTask]:
+        """
+        Searches tasks by the words in their names, best matches first. Use this to find a task when its exact name is not known.
+
+        Example call: search_tasks("invoices")
+        Example call within a project: search_tasks("invoices", "Project Name")
+        
+        Args:
+            query (str): The words to search for in the task names.
+            project_name (str): Only search the tasks of this project. Leave empty to search all projects.
+            limit (int): The maximum number of tasks to return (at most 200). Default is 10.
+        Returns:
+            list(AsanaTask): A list of the matching task objects if any, or an error message if the API call threw an error. 
+        """
+
+        tasks = self.__asana__.search_tasks(query, project_name, AsanaTools.__page_size__(limit))
         return tasks
 
     def update_task_status(self, task_id: str, status: str) -> bool:
@@ -258,6 +391,21 @@ class AsanaTools:
         result = self.__asana__.update_task_status(task_id, status)
         return result
 
+    def update_task_statuses(self, updates: List[AsanaTaskStatusUpdate]) -> int:
+        """
+        Updates the status of many existing task objects at once. Prefer this over calling update_task_status repeatedly.
+
+        Example call: update_task_statuses([{"task_id": "Task Id 1", "status": "Completed"}, {"task_id": "Task Id 2", "status": "In Progress"}])
+        
+        Args:
+            updates (List[AsanaTaskStatusUpdate]): The task ids and their new status. Possible status values: ['Not Started', 'In Progress', 'Completed'].
+        Returns:
+            int: The number of task objects updated, or an error message if the API call threw an error. 
+        """
+
+        result = self.__asana__.update_task_statuses(updates)
+        return result
+
     def update_task(self, task_id: str, model: str) -> AsanaTask:
         """
         Updates an existing task object for a given task id.
@@ -272,6 +420,7 @@ class AsanaTools:
                     "due_date": "(str) The due_date of the task to update.",
                     "status": "(str) The status of the task to update. Valid Status: ['Not Started', 'In Progress', 'Completed']",
                 }
+                Only include the properties to change, the others are left as they are.
         Returns:
             AsanaTask: Updated task object if successful, else None if not found, or an error message if the API call threw an error.
         """
@@ -297,6 +446,21 @@ class AsanaTools:
         result = self.__asana__.delete_task_by_id(task_id)
         return result
 
+    def delete_tasks(self, task_ids: List[str]) -> int:
+        """
+        Deletes many existing task objects at once by task ids. Prefer this over calling delete_task_by_id repeatedly.
+
+        Example call: delete_tasks(["Task Id 1", "Task Id 2"])
+        
+        Args:
+            task_ids (List[str]): The task ids of the task objects to delete.
+        Returns:
+            int: The number of task objects deleted, or an error message if the API call threw an error.              
+        """
+
+        result = self.__asana__.delete_tasks(task_ids)
+        return result
+
     def delete_task_by_name(self, project_name: str, name: str) -> bool:
         """
         Deletes an existing task object for a given project name and for a given task name.
@@ -313,5 +477,145 @@ class AsanaTools:
         result = self.__asana__.delete_task_by_name(project_name, name)
         return result
 
+    #----------------------#
+    #       SUMMARIES      #
+    #----------------------#
+
+    def get_task_status_counts(self, project_name: str = None) -> List[AsanaStatusCount]:
+        """
+        Counts the tasks by status for every project or for a given project name. Use this instead of listing tasks to answer "how many" questions.
+
+        Example call: get_task_status_counts()
+        Example call for one project: get_task_status_counts("Project Name")
+        
+        Args:
+            project_name (str): Only count the tasks of this project. Leave empty to count the tasks of all projects.
+        Returns:
+            list(AsanaStatusCount): A row per project and status with the number of tasks, or an error message if the API call threw an error. 
+        """
+
+        counts = self.__asana__.get_task_status_counts(project_name)
+        return counts
+
+    def get_project_summaries(self, project_name: str = None, as_of: str = None) -> List[AsanaProjectSummary]:
+        """
+        Summarizes every project or a given project name. Use this instead of listing tasks to answer questions about progress, overdue or upcoming tasks.
+
+        Example call: get_project_summaries()
+        Example call for one project: get_project_summaries("Project Name")
+        
+        Args:
+            project_name (str): Only summarize this project. Leave empty to summarize all projects.
+            as_of (str): The date used to decide which tasks are overdue, in the format YYYY-MM-DD. If not given, the current day is used.
+        Returns:
+            list(AsanaProjectSummary): A row per project with the total number of tasks, the completed tasks, the overdue tasks (not completed and due before as_of), 
+            the next due date of the open tasks and the done ratio (completed / total), or an error message if the API call threw an error. 
+        """
+
+        summaries = self.__asana__.get_project_summaries(project_name, as_of)
+        return summaries
+
     def get_tools(self) -> List[Tool]:
         return self.__tools__
+
+    @contextlib.contextmanager
+    def memoize(self) -> Iterator[AsanaToolCache]:
+        """
+        Memoizes the read tool results until the block exits, wrap an agent run (or a session) with it.
+
+        Example call: 
+            with tools.memoize() as cache:
+                result = await agent.run(prompt)
+            print(cache.served, cache.stats())
+        """
+
+        # NOTE:
+        # - The cache lives in a context variable, not on the instance, so concurrent runs (e.g. Streamlit sessions) sharing one tools instance 
+        #   each get their own cache, and the asyncio tasks started by the run inherit it.
+        # - AsyncAsanaTools carries the context over to its worker threads. The sync AsanaTools are run by pydantic_ai on the default executor, 
+        #   which doesn't, so memoize() only covers them when they are called directly; use AsyncAsanaTools with an agent.
+        cache = AsanaToolCache()
+        token = AsanaTools.__run_caches__.set({**AsanaTools.__run_caches__.get(), self: cache})
+        try:
+            yield cache
+        finally:
+            AsanaTools.__run_caches__.reset(token)
+
+    def __create_tool__(self, name: str, function: Callable, description: str) -> Tool:
+        # NOTE:
+        # - Building a Tool inspects the signature and docstring and builds a pydantic validator and JSON schema, ~1ms per tool.
+        # - The schema only depends on the tools class, so later instances copy the cached template and swap in their own bound function.
+        # - The template is stored without a function, so the class-level cache doesn't keep the first instance (and its database) alive.
+        function = self.__tool_function__(name, function)
+        template = AsanaTools.__schemas__.get((type(self), name))
+        if template is None:
+            template = copy.copy(Tool(name=name, function=function, description=description))
+            template.function = None
+            template = AsanaTools.__schemas__.setdefault((type(self), name), template)
+
+        tool = copy.copy(template)
+        tool.function = function
+        return tool
+
+    def __tool_function__(self, name: str, function: Callable) -> Callable:
+        result_format = self.__formats__.get(name, self.__default_format__)
+        signature = inspect.signature(function)
+        is_read = name in AsanaTools.READ_TOOLS
+
+        @functools.wraps(function)
+        def run(*args, **kwargs):
+            cache = AsanaTools.__run_caches__.get().get(self)
+            if cache is None:
+                return result_format.encode(function(*args, **kwargs))
+
+            if not is_read:
+                try:
+                    return result_format.encode(function(*args, **kwargs))
+                finally:
+                    cache.invalidate()
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            call = AsanaToolCache.call(name, arguments.arguments)
+            if call is not None and (result := cache.get(call)) is not AsanaToolCache.MISSING:
+                return result
+
+            version = cache.version
+            result = result_format.encode(function(*args, **kwargs))
+            if call is not None:
+                cache.put(call, result, version)
+
+            return result
+
+        return run
+
+    @staticmethod
+    def __page_size__(limit: int) -> int:
+        return max(1, min(limit or AsanaTools.DEFAULT_PAGE_SIZE, AsanaTools.MAX_PAGE_SIZE))
+
+
+class AsyncAsanaTools(AsanaTools):
+    # NOTE:
+    # - Same tools as AsanaTools, but each one is an async function that runs the database work off the event loop.
+    # - The agent runs the tool calls of one model response concurrently: the read tools run on a bounded thread pool (one SQLite connection per thread, 
+    #   WAL lets them read in parallel) and the write tools are serialized on a single writer thread.
+    # - The wrappers keep the signature and docstring of the sync tools, so the tool schemas seen by the model are unchanged.
+    # - Drop-in replacement: Agent(tools=AsyncAsanaTools().get_tools())
+    def __init__(self, storage: AsanaStorage = None, max_workers: int = 4, default_format: AsanaResultFormat = AsanaResultFormat(), formats: dict[str, AsanaResultFormat] = None):
+        super().__init__(storage, default_format, formats)
+        self.__async_asana__ = AsyncAsana_Api(self.__asana__, max_workers)
+
+    def close(self):
+        self.__async_asana__.close()
+
+    def __tool_function__(self, name: str, function: Callable) -> Callable:
+        function = super().__tool_function__(name, function)
+        is_read = name in AsanaTools.READ_TOOLS
+
+        @functools.wraps(function)
+        async def run_async(*args, **kwargs):
+            # the worker thread runs in a copy of the caller's context, so it sees the cache of the run (see memoize)
+            run = self.__async_asana__.run if is_read else self.__async_asana__.run_write
+            return await run(contextvars.copy_context().run, function, *args, **kwargs)
+
+        return run_async
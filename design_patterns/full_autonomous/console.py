@@ -3,21 +3,25 @@
 
 import os
 import sys
+import dataclasses
 from datetime import datetime
 from colorama import Fore
 from dotenv import load_dotenv
 from rich.prompt import Prompt
 from pydantic_ai import Agent
 from pydantic_ai.messages import TextPart
-from asana_tools import AsanaTools
+from asana_tools import AsyncAsanaTools
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from _utils.message_history import MessageHistory
+from _utils.message_history import MessageHistory, MessageWindow
 from _utils.utils import Utils
 
 load_dotenv()
 
-tools = AsanaTools()
+tools = AsyncAsanaTools()
+
+# a later call to the same read tool (with the same arguments) supersedes an earlier one, the write tool calls are always sent
+message_window = dataclasses.replace(MessageWindow.DEFAULT, drop_superseded_tool_calls=True, droppable_tools=AsyncAsanaTools.READ_TOOLS)
 
 
 async def main_async():            
@@ -31,7 +35,7 @@ async def main_async():
         )
     )
         
-    message_history = MessageHistory()
+    message_history = MessageHistory(message_window)
     Prompt.prompt_suffix = "> "
      
     while True:
@@ -48,14 +52,16 @@ async def main_async():
             
             try:
                 response_content = ""
-                async with agent.run_stream(prompt, message_history=message_history.get_all_messages()) as result:
-                    async for chunk in Utils.stream_result_async(result):
-                        response_content += chunk
-                        print(Fore.LIGHTGREEN_EX + chunk, end="")
+                # repeated reads within the run are served from the memoized tool results
+                with tools.memoize():
+                    async with agent.run_stream(prompt, message_history=message_history.get_prompt_messages()) as result:
+                        async for chunk in Utils.stream_result_async(result):
+                            response_content += chunk
+                            print(Fore.LIGHTGREEN_EX + chunk, end="")
                         
                 print()
                             
-                message_history.assign(result.all_messages())            
+                message_history.extend(result.new_messages())            
                 message_history.append(TextPart(content=response_content))        
             except Exception as e:
                 print(e)
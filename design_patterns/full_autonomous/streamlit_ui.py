@@ -7,42 +7,73 @@
 
 import os
 import sys
+import dataclasses
+import atexit
+import uuid
 import asyncio
 import streamlit as st
 from datetime import datetime
 from dotenv import load_dotenv
 from pydantic_ai import Agent
 from pydantic_ai.messages import TextPart
-from asana_tools import AsanaTools
+from asana_tools import AsyncAsanaTools
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from _utils.message_history import MessageHistory
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.message_store import MessageStore
 from _utils.utils import Utils
 
 load_dotenv()
 
-tools = AsanaTools()
+# NOTE:
+# - Streamlit re-executes this script on every rerun and runs each session on its own thread.
+# - The tools (and their Asana_Api, connection pool and worker threads) are created once for the process and shared by the sessions, 
+#   tools.memoize() keeps a separate cache per run, so sessions don't see each other's memoized results.
+# - The agent only holds the tool definitions and the prompt, it is created once per session and kept in the session state.
+# a later call to the same read tool (with the same arguments) supersedes an earlier one, the write tool calls are always sent
+message_window = dataclasses.replace(MessageWindow.DEFAULT, drop_superseded_tool_calls=True, droppable_tools=AsyncAsanaTools.READ_TOOLS)
 
-agent = Agent(
-    model="openai:gpt-4o-mini",
-    tools=tools.get_tools(),        
-    system_prompt=(
-        "You are a personal assistant to help manage project tasks. "
-        "Anytime the user requests a list of projects or tasks, always retrieve it using tools. "
-        f"The current date is: {datetime.now().date()}"
+@st.cache_resource
+def asana_tools() -> AsyncAsanaTools:
+    tools = AsyncAsanaTools()
+    atexit.register(tools.close)
+    return tools
+
+def create_agent(tools: AsyncAsanaTools) -> Agent:
+    agent = Agent(
+        model="openai:gpt-4o-mini",
+        tools=tools.get_tools(),        
+        system_prompt=(
+            "You are a personal assistant to help manage project tasks. "
+            "Anytime the user requests a list of projects or tasks, always retrieve it using tools. "
+            f"The current date is: {datetime.now().date()}"
+        )
     )
-)
+    return agent
         
+@st.cache_resource
+def message_store() -> MessageStore:
+    # one store (and sqlite connection) for the whole process, shared by the sessions
+    return MessageStore()
+
 async def main_async():
     st.title("Project/Task Manager")        
+
+    tools = asana_tools()
+    if "agent" not in st.session_state:
+        st.session_state.agent = create_agent(tools)
+
+    agent = st.session_state.agent
         
     if "messages" not in st.session_state:
-        # load for a database            
-        st.session_state.messages = MessageHistory()  
+        # the session id is kept in the url, so reloading the page (or a bookmark) resumes the conversation from the message store
+        if "session" not in st.query_params:
+            st.query_params["session"] = uuid.uuid4().hex
+
+        st.session_state.messages = MessageHistory.load(message_store(), st.query_params["session"], message_window, last_turns=message_window.max_turns)
      
     # display all user and ai messages
-    message_history = st.session_state.messages.get_all_messages()
-    for message in message_history:
+    for message in st.session_state.messages.get_all_messages():
         for part in message.parts:
             if part.part_kind in ["user-prompt", "text"]:
                 with st.chat_message("human" if part.part_kind == "user-prompt" else "ai"):
@@ -55,14 +86,16 @@ async def main_async():
         response_content = ""
         with st.chat_message("assistant"):
             message_placeholder = st.empty()             
-            async with agent.run_stream(prompt, message_history=message_history) as result:
-                async for chunk in Utils.stream_result_async(result):
-                    response_content += chunk
-                    message_placeholder.markdown(response_content)    
+            # repeated reads within the run are served from the memoized tool results
+            with tools.memoize():
+                async with agent.run_stream(prompt, message_history=st.session_state.messages.get_prompt_messages()) as result:
+                    async for chunk in Utils.stream_result_async(result):
+                        response_content += chunk
+                        message_placeholder.markdown(response_content)    
                 
             # update the latest history
-            st.session_state.messages.assign(result.all_messages())
-            st.session_state.messages.append(TextPart(content=response_content))            
+            st.session_state.messages.extend(result.new_messages())
+            st.session_state.messages.append(TextPart(content=response_content)).save()            
 
 if __name__ == "__main__":        
     asyncio.run(main_async())
@@ -16,12 +16,15 @@
 #  
 #  How I solved this was to remove the system prompt from the history, prior to calling the Specialist agent. 
 #  Im OK with this as I'm not sure how we can solve this unless there's a way never to add system prompts to history, some sort of flag or something.
+#  The history itself is left intact: each agent gets a view of it without the system prompts (history.get_prompt_messages("system-prompt")).
 
 
 from __future__ import annotations
 
 import os
+import copy
 import asyncio
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 from rich.prompt import Prompt
@@ -33,7 +36,8 @@ from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.usage import Usage
 from pydantic_graph import BaseNode, End, Graph, GraphRunContext
 
-from _utils.message_history import MessageHistory
+from _utils.message_history import MessageHistory, MessageWindow
+from _utils.session_manager import SessionManager
 
 load_dotenv()
 
@@ -53,16 +57,17 @@ class CallCentreResponse(BaseModel):
     usage: Usage | None = Field(default=None)    
     
 class CallCentre:
+    # NOTE: history and usage are created per state (default_factory), class-level defaults would be shared by every CallCentre in the process
+    @dataclass
     class GraphState:
         prompt: Optional[str] = None
-        specialist: Specialist = Field(default=Specialist.General)
+        specialist: Specialist = Specialist.General
         response: CallCentreResponse = None
-        history: MessageHistory = MessageHistory()
-        usage: Usage = Usage()              
+        history: MessageHistory = field(default_factory=lambda: MessageHistory(MessageWindow.DEFAULT))
+        usage: Usage = field(default_factory=Usage)
         
     class Specialist:
         def finalize(self, response: str, ctx: GraphRunContext[CallCentre.GraphState]):
-            ctx.state.history.remove_part_kind("system-prompt")                        
             ctx.state.response = CallCentreResponse(
                 specialist=ctx.state.specialist, 
                 response=response,
@@ -107,11 +112,11 @@ class CallCentre:
             if ctx.state.response is None:                    
                 result = await self.agent.run(
                     ctx.state.prompt,
-                    message_history=ctx.state.history.get_all_messages(),
+                    message_history=ctx.state.history.get_prompt_messages("system-prompt"),
                     usage=ctx.state.usage                
                 )
                 
-                ctx.state.history.assign(result.all_messages()).remove_part_kind("system-prompt")
+                ctx.state.history.extend(result.new_messages())
                 ctx.state.specialist = result.data.specialist                                                                                              
                         
                 match result.data.specialist:
@@ -147,11 +152,11 @@ class CallCentre:
         async def run(self, ctx: GraphRunContext[CallCentre.GraphState]) -> CallCentre.Supervisor:            
             result = await self.agent.run(
                 ctx.state.prompt,
-                message_history=ctx.state.history.get_all_messages(),
+                message_history=ctx.state.history.get_prompt_messages("system-prompt"),
                 usage=ctx.state.usage                
             )            
             
-            ctx.state.history.assign(result.all_messages())      
+            ctx.state.history.extend(result.new_messages())
             super().finalize(response=result.data, ctx=ctx)
                              
             return CallCentre.Supervisor()  
@@ -175,11 +180,11 @@ class CallCentre:
         async def run(self, ctx: GraphRunContext[CallCentre.GraphState]) -> CallCentre.Supervisor:
             result = await self.agent.run(
                 ctx.state.prompt,
-                message_history=ctx.state.history.get_all_messages(),
+                message_history=ctx.state.history.get_prompt_messages("system-prompt"),
                 usage=ctx.state.usage                
             )            
             
-            ctx.state.history.assign(result.all_messages())      
+            ctx.state.history.extend(result.new_messages())
             super().finalize(response=result.data, ctx=ctx)
             
             return CallCentre.Supervisor()  
@@ -203,31 +208,46 @@ class CallCentre:
         async def run(self, ctx: GraphRunContext[CallCentre.GraphState]) -> CallCentre.Supervisor:
             result = await self.agent.run(
                 ctx.state.prompt,
-                message_history=ctx.state.history.get_all_messages(),
+                message_history=ctx.state.history.get_prompt_messages("system-prompt"),
                 usage=ctx.state.usage                
             )            
             
-            ctx.state.history.assign(result.all_messages())      
+            ctx.state.history.extend(result.new_messages())
             super().finalize(response=result.data, ctx=ctx)
               
             return CallCentre.Supervisor()  
     
-    def __init__(self):
+    def __init__(self, sessions: SessionManager = None):
+        # with a SessionManager, every session id gets its own history and usage, otherwise the instance keeps a single state
+        self.sessions = sessions
         self.reset_state()
         
+        # NOTE: the graph snapshots the state at every step, by default with a deep copy. The history holds the session's MessageStore 
+        #       (a lock and a sqlite connection, which can't be copied) and grows with the conversation, so the snapshots are shallow.
         self.graph = Graph(nodes=[
             CallCentre.Supervisor, 
             CallCentre.BillingAccountSpecialist, 
             CallCentre.TechnicalSupportSpecialist,
             CallCentre.ProductServiceSpecialist,
-        ])                
+        ], snapshot_state=copy.copy)                
         
-    async def ask_async(self, prompt: str) -> CallCentreResponse:
-        self.state.prompt = prompt 
-        self.state.response = None
-               
-        await self.graph.run(CallCentre.Supervisor(), state=self.state)
-        return self.state.response
+    async def ask_async(self, prompt: str, session_id: str = None) -> CallCentreResponse:
+        if self.sessions is None:
+            return await self.__ask_async(prompt, self.state)
+
+        if session_id is None:
+            raise ValueError("A session id is required when the call centre has a SessionManager")
+
+        # the session is loaded and saved (SQLite I/O) on a worker thread, and a second turn of the same session waits for this one
+        async with self.sessions.session_async(session_id) as session:
+            return await self.__ask_async(prompt, CallCentre.GraphState(history=session.history, usage=session.usage))
+
+    async def __ask_async(self, prompt: str, state: CallCentre.GraphState) -> CallCentreResponse:
+        state.prompt = prompt
+        state.response = None
+
+        await self.graph.run(CallCentre.Supervisor(), state=state)
+        return state.response
 
     def reset_state(self):
         self.state = CallCentre.GraphState()
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import os
 import asyncio
+from dataclasses import dataclass, field
 from typing import Callable
 from rich.prompt import Prompt
 from colorama import Fore
@@ -25,7 +26,7 @@ from pydantic_ai.messages import TextPart
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.usage import Usage
 from call_centre_tools import CallCentreTools, CallCentreToolStates
-from _utils.message_history import MessageHistory
+from _utils.message_history import MessageHistory, MessageWindow
 from _utils.utils import Utils
 
 load_dotenv()
@@ -38,9 +39,11 @@ class CallCentreResponse:
         self.usage = usage             
     
 class CallCentre:    
-    class States:                
-        history: MessageHistory = MessageHistory()
-        usage: Usage = Usage()
+    # NOTE: history and usage are created per instance (default_factory), class-level defaults would be shared by every CallCentre in the process
+    @dataclass
+    class States:
+        history: MessageHistory = field(default_factory=lambda: MessageHistory(MessageWindow.DEFAULT))
+        usage: Usage = field(default_factory=Usage)
         
     def __init__(self):
         self.initialize()
@@ -69,14 +72,14 @@ class CallCentre:
         final_response = ""
         async with self.supervisor.run_stream(
             prompt, 
-            message_history=self.states.history.get_all_messages(),
+            message_history=self.states.history.get_prompt_messages(),
             usage=self.states.usage 
         ) as result:
             async for chunk in Utils.stream_result_async(result):
                 final_response += chunk
                 stream_parts(chunk)
         
-        self.states.history.assign(result.all_messages())
+        self.states.history.extend(result.new_messages())
         self.states.history.append(TextPart(content=final_response))   
         
         # print()